@@ -0,0 +1,387 @@
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import yaml
+from services.arbiter import Arbiter
+from utils.assignment import ASSIGNMENT_MODES
+from utils.distance_calculator import DistanceCalculator
+from utils.lru_cache import LRUCache
+from utils.synthetic import generate_assets, generate_tracks, jitter, moving
+
+# A benchmark regresses when a metric exceeds its baseline by more than these
+# fractions. Latency is noisier across runs than allocation, so it gets more slack.
+DEFAULT_LATENCY_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.1
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+MEMORY_METRICS = ("peak_kib",)
+# Untimed cycles run first so one-off setup (cache fills, imports) isn't measured.
+WARMUP_CYCLES = 3
+# Cycles run under tracemalloc to measure allocations; tracing is too slow to
+# leave on for the timed cycles.
+ALLOCATION_CYCLES = 3
+# Fraction of tracks moved between incremental arbitration cycles.
+INCREMENTAL_MOVE_FRACTION = 0.01
+DISTANCE_PAIRS_PER_CYCLE = 100
+LRU_OPERATIONS_PER_CYCLE = 20000
+ORBIT_SPECIFICATIONS_PER_CYCLE = 100
+# Look-ahead of the predicted arbitration pass, and the fastest synthetic track.
+PREDICTION_HORIZON_SECONDS = 30
+# Fixed rather than one per CPU, so a baseline's population matches on any machine.
+DEFAULT_WORKERS = 1
+MAX_TRACK_SPEED_MPS = 150
+
+ORBIT_PARAMS = {
+    "orbit_radius": 1000,
+    "orbit_height": 100,
+    "orbit_direction": "ORBIT_CLOCKWISE",
+}
+
+
+def stub_network(arbiter: Arbiter):
+    """Replace every Lattice call the arbiter makes with an immediate local result.
+
+    Tasks report as finished on the next status check, so each full cycle
+    re-plans and re-tasks every in-range pair: the worst case for a pass.
+    """
+    task_ids = itertools.count()
+
+    async def orbit(asset, track):
+        return f"benchmark-task-{next(task_ids)}"
+
+    async def check_executing(task_id):
+        return False
+
+    async def override_track_disposition(track):
+        return True
+
+    arbiter.tasker.orbit = orbit
+    arbiter.tasker.check_executing = check_executing
+    arbiter.entity_handler.override_track_disposition = override_track_disposition
+
+
+def build_arbiter(args, assets, tracks, **options) -> Arbiter:
+    logger = logging.getLogger("BENCH")
+    logger.setLevel(logging.WARNING)
+    arbiter = Arbiter(
+        logger,
+        "localhost",
+        "benchmark",
+        "benchmark",
+        orbit_params=ORBIT_PARAMS,
+        task_status_ttl=0,
+        assignment_mode=args.assignment_mode,
+        cache_params={
+            "asset_capacity": len(assets) + 1,
+            "track_capacity": len(tracks) + 1,
+            "asset_task_capacity": len(assets) + 1,
+            "track_task_capacity": len(tracks) + 1,
+        },
+        **options,
+    )
+    stub_network(arbiter)
+    for entity in assets + tracks:
+        arbiter.cache_manager.handle_response(entity)
+    return arbiter
+
+
+def distance_calculate_cycles(args, assets, tracks):
+    rng = random.Random(args.seed)
+    pairs = [
+        (rng.choice(assets), rng.choice(tracks))
+        for _ in range(DISTANCE_PAIRS_PER_CYCLE)
+    ]
+
+    def cycle():
+        for asset, track in pairs:
+            DistanceCalculator.calculate(asset, track)
+
+    return cycle
+
+
+def handle_response_cycles(args, assets, tracks):
+    arbiter = build_arbiter(args, assets, tracks)
+    rng = random.Random(args.seed)
+    # Pre-generate moved copies so the cycle only times ingestion.
+    batches = [jitter(assets + tracks, rng, 0.5) for _ in range(min(args.cycles, 4))]
+    batch_cycle = itertools.cycle(batches)
+
+    def cycle():
+        for entity in next(batch_cycle):
+            arbiter.cache_manager.handle_response(entity)
+
+    return cycle
+
+
+def lru_cache_cycles(args, assets, tracks):
+    rng = random.Random(args.seed)
+    capacity = len(tracks)
+    cache = LRUCache(capacity)
+    # Twice as many keys as slots, so puts mix updates with evictions and gets
+    # mix hits with misses.
+    keys = [
+        f"key-{rng.randrange(2 * capacity)}" for _ in range(LRU_OPERATIONS_PER_CYCLE)
+    ]
+
+    def cycle():
+        for key in keys[: LRU_OPERATIONS_PER_CYCLE // 2]:
+            cache.put(key, key)
+        for key in keys[LRU_OPERATIONS_PER_CYCLE // 2 :]:
+            cache.get(key)
+
+    return cycle
+
+
+def orbit_specification_cycles(args, assets, tracks):
+    arbiter = build_arbiter(args, assets, tracks)
+    targets = arbiter.cache_manager.get_tracks()[:ORBIT_SPECIFICATIONS_PER_CYCLE]
+
+    def cycle():
+        for track in targets:
+            arbiter.tasker.build_orbit_specification(track)
+
+    return cycle
+
+
+def arbitrate_full_cycles(args, assets, tracks):
+    arbiter = build_arbiter(args, assets, tracks)
+
+    async def cycle():
+        await arbiter.arbitrate_isr(full_scan=True)
+
+    return cycle
+
+
+def arbitrate_sharded_cycles(args, assets, tracks):
+    arbiter = build_arbiter(args, assets, tracks, arbitration_workers=args.workers)
+
+    async def cycle():
+        await arbiter.arbitrate_isr(full_scan=True)
+
+    return cycle
+
+
+def arbitrate_predicted_cycles(args, assets, tracks):
+    rng = random.Random(args.seed)
+    arbiter = build_arbiter(
+        args,
+        assets,
+        moving(tracks, rng, MAX_TRACK_SPEED_MPS),
+        prediction_horizon=PREDICTION_HORIZON_SECONDS,
+    )
+
+    async def cycle():
+        await arbiter.arbitrate_isr(full_scan=True)
+
+    return cycle
+
+
+def arbitrate_incremental_cycles(args, assets, tracks):
+    arbiter = build_arbiter(args, assets, tracks)
+    rng = random.Random(args.seed)
+    moved_count = max(1, int(len(tracks) * INCREMENTAL_MOVE_FRACTION))
+
+    async def cycle():
+        for entity in jitter(rng.sample(tracks, moved_count), rng, 0.5):
+            arbiter.cache_manager.handle_response(entity)
+        await arbiter.arbitrate_isr(full_scan=False)
+
+    return cycle
+
+
+BENCHMARKS = {
+    "distance-calculate": distance_calculate_cycles,
+    "handle-response": handle_response_cycles,
+    "lru-cache": lru_cache_cycles,
+    "orbit-specification": orbit_specification_cycles,
+    "arbitrate-full": arbitrate_full_cycles,
+    "arbitrate-sharded": arbitrate_sharded_cycles,
+    "arbitrate-predicted": arbitrate_predicted_cycles,
+    "arbitrate-incremental": arbitrate_incremental_cycles,
+}
+
+
+async def run_cycle(cycle):
+    result = cycle()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def measure(cycle, cycles: int) -> dict:
+    """Time `cycles` runs of `cycle`, then trace allocations over a few more."""
+    for _ in range(WARMUP_CYCLES):
+        await run_cycle(cycle)
+    latencies = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        await run_cycle(cycle)
+        latencies.append(time.perf_counter() - start)
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_CYCLES):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await run_cycle(cycle)
+            _, cycle_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, cycle_peak - before)
+    finally:
+        tracemalloc.stop()
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    return {
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+async def run_benchmarks(args) -> dict:
+    center = (args.latitude, args.longitude)
+    assets = generate_assets(args.assets, center, args.radius_miles, args.seed)
+    tracks = generate_tracks(args.tracks, center, args.radius_miles, args.seed)
+    results = {}
+    for name, build in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        results[name] = await measure(build(args, assets, tracks), args.cycles)
+    return results
+
+
+def population(args) -> dict:
+    return {
+        "assets": args.assets,
+        "tracks": args.tracks,
+        "radius-miles": args.radius_miles,
+        "latitude": args.latitude,
+        "longitude": args.longitude,
+        "cycles": args.cycles,
+        "assignment-mode": args.assignment_mode,
+        "workers": args.workers,
+        "seed": args.seed,
+    }
+
+
+def print_results(results: dict):
+    print(
+        f"{'benchmark':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>12}"
+    )
+    for name, metrics in results.items():
+        print(
+            f"{name:<24}{metrics['p50_ms']:>10.3f}{metrics['p95_ms']:>10.3f}"
+            f"{metrics['p99_ms']:>10.3f}{metrics['peak_kib']:>12.1f}"
+        )
+
+
+def find_regressions(
+    results: dict, baseline: dict, latency_tolerance: float, memory_tolerance: float
+) -> list[str]:
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for metric in LATENCY_METRICS + MEMORY_METRICS:
+            tolerance = (
+                latency_tolerance if metric in LATENCY_METRICS else memory_tolerance
+            )
+            limit = expected[metric] * (1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{name} {metric}: {metrics[metric]} > {expected[metric]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Offline auto reconnaissance benchmarks with synthetic entities"
+    )
+    parser.add_argument("--assets", type=int, default=200, help="Number of assets")
+    parser.add_argument("--tracks", type=int, default=2000, help="Number of tracks")
+    parser.add_argument(
+        "--radius-miles",
+        type=float,
+        default=50,
+        help="Radius of the disc entities are spread over; smaller is denser",
+    )
+    parser.add_argument("--latitude", type=float, default=21.09, help="Disc centre")
+    parser.add_argument("--longitude", type=float, default=-11.38, help="Disc centre")
+    parser.add_argument(
+        "--cycles", type=int, default=50, help="Timed cycles per benchmark"
+    )
+    parser.add_argument("--assignment-mode", choices=ASSIGNMENT_MODES, default="greedy")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Worker processes for the arbitrate-sharded benchmark",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Population random seed")
+    parser.add_argument(
+        "--only", nargs="+", choices=list(BENCHMARKS), help="Benchmarks to run"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Baseline file to compare against; regressions exit 1",
+    )
+    parser.add_argument(
+        "--write-baseline", type=str, help="Write the results to this baseline file"
+    )
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=DEFAULT_LATENCY_TOLERANCE,
+        help="Allowed fractional slowdown over the baseline",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=DEFAULT_MEMORY_TOLERANCE,
+        help="Allowed fractional allocation growth over the baseline",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results = asyncio.run(run_benchmarks(args))
+    print_results(results)
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as ymlfile:
+            yaml.safe_dump(
+                {"population": population(args), "results": results},
+                ymlfile,
+                sort_keys=False,
+            )
+        print(f"wrote baseline to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline, "r") as ymlfile:
+            baseline = yaml.safe_load(ymlfile)
+        if baseline["population"] != population(args):
+            sys.exit(
+                f"baseline was recorded for {baseline['population']}, not {population(args)}"
+            )
+        regressions = find_regressions(
+            results,
+            baseline["results"],
+            args.latency_tolerance,
+            args.memory_tolerance,
+        )
+        if regressions:
+            print("regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
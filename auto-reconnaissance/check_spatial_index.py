@@ -0,0 +1,65 @@
+"""Check that SpatialGrid radius queries find every pair an all-pairs scan finds.
+
+Entities are scattered near the antimeridian and the poles, where the grid's
+longitude columns wrap and widen, and each query's candidates are compared
+with an exact haversine scan over every entity. Exits non-zero if the grid
+misses an entity within the radius.
+"""
+
+import random
+import sys
+
+import numpy as np
+from utils.distance_calculator import DistanceCalculator
+from utils.spatial_index import SpatialGrid
+
+CELL_SIZES_MILES = (1, 3, 5, 7, 13)
+ENTITIES = 2000
+QUERIES = 200
+# A pair 4.3 miles apart across the antimeridian, once missed by a 5 mile grid.
+STRADDLING_PAIR = ((0.0, -179.98), (0.0, 179.96))
+
+
+def random_position(rng: random.Random) -> tuple[float, float]:
+    latitude = rng.choice((rng.uniform(-60, 60), rng.uniform(80, 90)))
+    longitude = rng.choice((rng.uniform(-180, -179), rng.uniform(179, 180)))
+    return latitude, longitude
+
+
+def main() -> int:
+    rng = random.Random(0)
+    failures = []
+    (query_lat, query_lon), (track_lat, track_lon) = STRADDLING_PAIR
+    grid = SpatialGrid(5)
+    grid.update("track", track_lat, track_lon)
+    if "track" not in grid.query(query_lat, query_lon, 5):
+        failures.append(f"antimeridian pair {STRADDLING_PAIR} not found")
+    for cell_size in CELL_SIZES_MILES:
+        grid = SpatialGrid(cell_size)
+        positions = [random_position(rng) for _ in range(ENTITIES)]
+        for index, (latitude, longitude) in enumerate(positions):
+            grid.update(index, latitude, longitude)
+        radius = cell_size * 1.5
+        for _ in range(QUERIES):
+            origin = random_position(rng)
+            distances = DistanceCalculator.distance_matrix(
+                np.array([origin]), np.array(positions)
+            )[0]
+            found = set(grid.query(*origin, radius))
+            missed = [
+                index
+                for index in np.flatnonzero(distances <= radius).tolist()
+                if index not in found
+            ]
+            if missed:
+                failures.append(
+                    f"{cell_size} mile grid missed {len(missed)} entities within {radius} miles of {origin}"
+                )
+    for failure in failures:
+        print(failure)
+    print("grid queries match an all-pairs scan" if not failures else "misses found")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
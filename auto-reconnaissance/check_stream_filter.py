@@ -0,0 +1,71 @@
+"""Check that the server-side entity stream filter keeps what `filter_entity` keeps.
+
+Serializes `build_stream_filter()` the way the SDK sends it, evaluates it with
+the fake Lattice's filter evaluator against a track or asset of every
+disposition, and compares each verdict with `EntityHandler.filter_entity`.
+It also pins the disposition numbers to the ones Lattice documents, since
+the client and the fake both derive theirs from the SDK and would otherwise
+agree on a wrong mapping. Exits non-zero on any mismatch.
+"""
+
+import logging
+import sys
+import typing
+from pathlib import Path
+
+from anduril import Entity, MilView, Ontology, Statement
+from anduril.core.jsonable_encoder import jsonable_encoder
+from anduril.core.serialization import convert_and_respect_annotation_metadata
+from anduril.types.mil_view_disposition import MilViewDisposition
+from services.entity_handler import EntityHandler, build_stream_filter, enum_numbers
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "fake_lattice"))
+from server import matches
+
+# Numbers from the ontology.v1 Disposition enum, as given in the EnumType docs.
+DOCUMENTED_DISPOSITIONS = {
+    "DISPOSITION_UNKNOWN": 0,
+    "DISPOSITION_FRIENDLY": 1,
+    "DISPOSITION_HOSTILE": 2,
+}
+
+
+def main() -> int:
+    handler = EntityHandler(logging.getLogger(__name__), "localhost", "id", "secret")
+    statement = jsonable_encoder(
+        convert_and_respect_annotation_metadata(
+            object_=build_stream_filter(), annotation=Statement, direction="write"
+        )
+    )
+    failures = []
+    numbers = enum_numbers(MilViewDisposition)
+    for name, number in DOCUMENTED_DISPOSITIONS.items():
+        if numbers.get(name) != number:
+            failures.append(f"{name} is numbered {numbers.get(name)}, not {number}")
+    dispositions = typing.get_args(typing.get_args(MilViewDisposition)[0])
+    for template in ("TEMPLATE_TRACK", "TEMPLATE_ASSET"):
+        for disposition in dispositions:
+            wire = {
+                "entityId": "check",
+                "ontology": {"template": template},
+                "milView": {"disposition": disposition},
+            }
+            entity = Entity(
+                entity_id="check",
+                ontology=Ontology(template=template),
+                mil_view=MilView(disposition=disposition),
+            )
+            server = matches(wire, statement)
+            client = handler.filter_entity(entity)
+            if server != client:
+                failures.append(
+                    f"{template} {disposition}: stream filter {server}, filter_entity {client}"
+                )
+    for failure in failures:
+        print(failure)
+    print("stream filter matches filter_entity" if not failures else "mismatches found")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,27 @@ import logging
 from asyncio import run
 
 import yaml
-from services.arbiter import Arbiter
+from services.arbiter import (
+    DEFAULT_INGEST_QUEUE_DEPTH,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PREDICTION_HORIZON_SECONDS,
+    FULL_RESCAN_INTERVAL_SECONDS,
+    Arbiter,
+)
+from services.cache_manager import (
+    DEFAULT_ASSET_CAPACITY,
+    DEFAULT_ASSET_TASK_CAPACITY,
+    DEFAULT_TRACK_CAPACITY,
+    DEFAULT_TRACK_TASK_CAPACITY,
+)
+from services.override_queue import DEFAULT_OVERRIDE_COOLDOWN_SECONDS
+from services.ownership import DEFAULT_LEASE_SECONDS, DEFAULT_PARTITION_COUNT
+from services.profiler import DEFAULT_PROFILE_CYCLES, DEFAULT_PROFILE_DIR
+from services.recon_metrics import DEFAULT_METRICS_HOST, DEFAULT_METRICS_PORT
+from services.task_status_cache import DEFAULT_TASK_STATUS_TTL_SECONDS
+from utils.assignment import ASSIGNMENT_MODES
+from utils.sharding import DEFAULT_SHARD_TILE_MILES
+from utils.track_history import DEFAULT_TRACK_HISTORY_DEPTH
 
 
 def validate_config(cfg):
@@ -19,6 +39,10 @@ def validate_config(cfg):
             "sandboxes-token not set - required for connecting to Lattice Sandboxes"
         )
         cfg["sandboxes-token"] = None
+    if cfg.get("assignment-mode", "greedy") not in ASSIGNMENT_MODES:
+        raise ValueError(
+            f"assignment-mode must be one of {', '.join(ASSIGNMENT_MODES)}"
+        )
 
 
 def parse_arguments():
@@ -48,6 +72,20 @@ async def main_async(cfg):
             "orbit_height": cfg["orbit-height-meters"],
             "orbit_direction": cfg["orbit-direction"],
         }
+        # Per-map cache capacities; entities also leave the cache on expiry.
+        cache_params = {
+            "asset_capacity": cfg.get("asset-cache-capacity", DEFAULT_ASSET_CAPACITY),
+            "track_capacity": cfg.get("track-cache-capacity", DEFAULT_TRACK_CAPACITY),
+            "asset_task_capacity": cfg.get(
+                "asset-task-cache-capacity", DEFAULT_ASSET_TASK_CAPACITY
+            ),
+            "track_task_capacity": cfg.get(
+                "track-task-cache-capacity", DEFAULT_TRACK_TASK_CAPACITY
+            ),
+            "track_history_depth": cfg.get(
+                "track-history-depth", DEFAULT_TRACK_HISTORY_DEPTH
+            ),
+        }
         # Set up the application with the config
         arbiter = Arbiter(
             logger,
@@ -56,6 +94,38 @@ async def main_async(cfg):
             cfg["lattice-client-secret"],
             cfg["sandboxes-token"],
             orbit_params,
+            full_rescan_interval=cfg.get(
+                "full-rescan-interval-seconds", FULL_RESCAN_INTERVAL_SECONDS
+            ),
+            task_status_ttl=cfg.get(
+                "task-status-ttl-seconds", DEFAULT_TASK_STATUS_TTL_SECONDS
+            ),
+            max_concurrency=cfg.get("lattice-max-concurrency", DEFAULT_MAX_CONCURRENCY),
+            override_cooldown=cfg.get(
+                "override-cooldown-seconds", DEFAULT_OVERRIDE_COOLDOWN_SECONDS
+            ),
+            assignment_mode=cfg.get("assignment-mode", "greedy"),
+            priority_weight_miles=cfg.get("assignment-priority-weight-miles", 0.0),
+            cache_params=cache_params,
+            ingest_queue_depth=cfg.get(
+                "ingest-queue-depth", DEFAULT_INGEST_QUEUE_DEPTH
+            ),
+            metrics_host=cfg.get("metrics-host", DEFAULT_METRICS_HOST),
+            metrics_port=cfg.get("metrics-port", DEFAULT_METRICS_PORT),
+            profile_dir=cfg.get("profile-dir", DEFAULT_PROFILE_DIR),
+            profile_cycles=cfg.get("profile-cycles", DEFAULT_PROFILE_CYCLES),
+            arbitration_workers=cfg.get("arbitration-workers", 0),
+            shard_tile_miles=cfg.get("shard-tile-miles", DEFAULT_SHARD_TILE_MILES),
+            task_store=cfg.get("task-store"),
+            coordination_db=cfg.get("coordination-db"),
+            instance_id=cfg.get("instance-id"),
+            partition_count=cfg.get("partition-count", DEFAULT_PARTITION_COUNT),
+            partition_lease_seconds=cfg.get(
+                "partition-lease-seconds", DEFAULT_LEASE_SECONDS
+            ),
+            prediction_horizon=cfg.get(
+                "prediction-horizon-seconds", DEFAULT_PREDICTION_HORIZON_SECONDS
+            ),
         )
         await arbiter.start()
     except (KeyboardInterrupt, SystemExit):
@@ -1,13 +1,51 @@
 import asyncio
+import os
+import signal
+import time
 from logging import Logger
 
-from anduril.core import ApiError
+import numpy as np
 from services.cache_manager import CacheManager
+from services.coordination import SqliteCoordinator
 from services.entity_handler import EntityHandler
+from services.override_queue import DEFAULT_OVERRIDE_COOLDOWN_SECONDS, OverrideQueue
+from services.ownership import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_PARTITION_COUNT,
+    PartitionOwnership,
+)
+from services.profiler import DEFAULT_PROFILE_CYCLES, DEFAULT_PROFILE_DIR, CycleProfiler
+from services.recon_metrics import (
+    DEFAULT_METRICS_HOST,
+    DEFAULT_METRICS_PORT,
+    ReconMetrics,
+)
+from services.task_status_cache import DEFAULT_TASK_STATUS_TTL_SECONDS, TaskStatusCache
+from services.task_store import TaskStore
 from services.tasker import Tasker
+from utils.assignment import AssignmentSolver
+from utils.coalescing_queue import CoalescingQueue
+from utils.deadline import DeadlineSchedule
 from utils.distance_calculator import DistanceCalculator
+from utils.metrics import serve_metrics
+from utils.sharding import DEFAULT_SHARD_TILE_MILES, ShardPool
 
 DISTANCE_THRESHOLD_MILES = 5
+# Task completion isn't visible on the entity stream, so even with no entity
+# changes every pair is re-evaluated at least this often.
+FULL_RESCAN_INTERVAL_SECONDS = 5
+# Cap on Lattice calls (task creation, status checks, overrides) in flight at once.
+DEFAULT_MAX_CONCURRENCY = 8
+# Weight of the latest incremental pass in the running estimate of their cost.
+INCREMENTAL_COST_SMOOTHING = 0.2
+# Most distinct entities buffered between the stream and the cache.
+DEFAULT_INGEST_QUEUE_DEPTH = 10000
+# How far ahead moving tracks are projected to task assets before they
+# arrive; 0 only tasks tracks already in range.
+DEFAULT_PREDICTION_HORIZON_SECONDS = 0
+# Cap on how far beyond the threshold assets are searched for around a
+# moving track, so one wild velocity can't turn into a search of the map.
+MAX_LOOKAHEAD_MILES = 25
 
 
 class Arbiter:
@@ -19,12 +57,55 @@ class Arbiter:
         client_secret: str,
         sandboxes_token: str | None = None,
         orbit_params: dict | None = None,
+        full_rescan_interval: float = FULL_RESCAN_INTERVAL_SECONDS,
+        task_status_ttl: float = DEFAULT_TASK_STATUS_TTL_SECONDS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        override_cooldown: float = DEFAULT_OVERRIDE_COOLDOWN_SECONDS,
+        assignment_mode: str = "greedy",
+        priority_weight_miles: float = 0.0,
+        cache_params: dict | None = None,
+        ingest_queue_depth: int = DEFAULT_INGEST_QUEUE_DEPTH,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+        metrics_port: int | None = DEFAULT_METRICS_PORT,
+        profile_dir: str = DEFAULT_PROFILE_DIR,
+        profile_cycles: int = DEFAULT_PROFILE_CYCLES,
+        arbitration_workers: int = 0,
+        shard_tile_miles: float = DEFAULT_SHARD_TILE_MILES,
+        coordination_db: str | None = None,
+        instance_id: str | None = None,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
+        partition_lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        task_store: str | None = None,
+        prediction_horizon: float = DEFAULT_PREDICTION_HORIZON_SECONDS,
     ):
         self.logger = logger
+        self.metrics_host = metrics_host
+        self.metrics_port = metrics_port
+        self.metrics = ReconMetrics()
+        self.profiler = CycleProfiler(logger, profile_dir, profile_cycles)
+        self.assignment_mode = assignment_mode
+        self.priority_weight_miles = priority_weight_miles
+        self.full_rescan_interval = full_rescan_interval
+        self.prediction_horizon = prediction_horizon
+        # One limit shared by every Lattice call made while arbitrating.
+        concurrency = asyncio.Semaphore(max_concurrency)
         self.entity_handler = EntityHandler(
-            logger, lattice_endpoint, client_id, client_secret, sandboxes_token
+            logger,
+            lattice_endpoint,
+            client_id,
+            client_secret,
+            sandboxes_token,
+            concurrency,
+            self.metrics,
+        )
+        self.overrides = OverrideQueue(logger, self.entity_handler, override_cooldown)
+        self.cache_manager = CacheManager(
+            index_cell_miles=DISTANCE_THRESHOLD_MILES,
+            # Drops the status, and the TaskStore row, of a task the cache no
+            # longer tracks, so restarts don't reload it.
+            on_task_evicted=lambda task_id: self.task_statuses.forget(task_id),
+            **(cache_params or {}),
         )
-        self.cache_manager = CacheManager()
         self.tasker = Tasker(
             logger,
             lattice_endpoint,
@@ -32,13 +113,79 @@ class Arbiter:
             client_secret,
             sandboxes_token,
             orbit_params,
+            concurrency,
+            self.metrics,
+        )
+        # Tasks in flight are persisted here, when configured, so a restart
+        # picks up where the previous run left off.
+        self.task_store = TaskStore(task_store) if task_store else None
+        self.task_statuses = TaskStatusCache(
+            logger, self.tasker, task_status_ttl, self.task_store
         )
+        # Sits between the stream and the cache; only the newest update per
+        # entity is kept, so a burst never turns into a backlog of stale positions.
+        self.ingest_queue = CoalescingQueue(ingest_queue_depth)
+        self.metrics.watch_cache(self.cache_manager)
+        self.metrics.watch_ingest_queue(self.ingest_queue)
+        self.metrics.watch_stream(self.entity_handler)
+        self.metrics.watch_overrides(self.overrides)
+        # With workers configured, full scans are range-checked across a
+        # process pool by geographic tile instead of on the event loop.
+        self.shards = (
+            ShardPool(arbitration_workers, DISTANCE_THRESHOLD_MILES, shard_tile_miles)
+            if arbitration_workers
+            else None
+        )
+        # With a coordination database, tracks are divided between every
+        # instance sharing it and this one only arbitrates its own partitions.
+        self.ownership = (
+            PartitionOwnership(
+                logger,
+                SqliteCoordinator(coordination_db),
+                instance_id,
+                partition_count,
+                partition_lease_seconds,
+            )
+            if coordination_db
+            else None
+        )
+        if self.ownership:
+            self.metrics.watch_ownership(self.ownership)
 
     async def start(self):
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGUSR1, self.profiler.request
+            )
+            self.logger.info(
+                f"send SIGUSR1 to pid {os.getpid()} to profile "
+                f"{self.profiler.cycles} arbitration cycles"
+            )
+        if self.metrics_port is not None:
+            await serve_metrics(
+                self.metrics.registry,
+                self.metrics_host,
+                self.metrics_port,
+                {"/profile": self.request_profile},
+            )
+            self.logger.info(
+                f"serving metrics on http://{self.metrics_host}:{self.metrics_port}/metrics"
+            )
+        if self.task_store:
+            await self.restore_tasks()
+        if self.ownership:
+            self.drop_lost_claims(await self.ownership.renew(self.held_entities()))
         tasks = [
             asyncio.create_task(self.consume_entities()),
+            asyncio.create_task(self.ingest_entities()),
             asyncio.create_task(self.recon_job()),
         ]
+        if self.ownership:
+            tasks.append(
+                asyncio.create_task(
+                    self.ownership.maintain(self.held_entities, self.drop_lost_claims)
+                )
+            )
         try:
             await asyncio.gather(*tasks, return_exceptions=True)
         except KeyboardInterrupt:
@@ -46,71 +193,514 @@ class Arbiter:
             for task in tasks:
                 task.cancel()
         finally:
+            if self.shards:
+                self.shards.shutdown()
+            if self.ownership:
+                # Hand partitions and assets straight to the other instances
+                # rather than making them wait out the leases.
+                self.ownership.release_all()
+            if self.task_store:
+                self.task_store.close()
             self.logger.info("Shutting down Entity Auto Recon System")
 
+    async def restore_tasks(self):
+        """Reload the tasks in flight at the last shutdown and re-check them in one batch.
+
+        Tasks still executing go back into the task caches, so their assets
+        and tracks aren't tasked again; finished ones are dropped from the
+        store. A task whose status can't be fetched is assumed to still be
+        running, and is re-checked by the normal arbitration passes.
+        """
+        stored = self.task_store.load()
+        if not stored:
+            return
+        started = time.monotonic()
+        await self.task_statuses.refresh(task.task_id for task in stored)
+        finished = []
+        for task in stored:
+            status = self.task_statuses.statuses.get(task.task_id)
+            if status is not None and not status[0]:
+                finished.append(task.task_id)
+                continue
+            self.cache_manager.restore_task(task.asset_id, task.track_id, task.task_id)
+        self.task_store.forget(finished)
+        self.logger.info(
+            f"restored {len(stored) - len(finished)} in-flight tasks and dropped {len(finished)} finished ones in {time.monotonic() - started:.2f}s"
+        )
+
+    def request_profile(self) -> str:
+        self.profiler.request()
+        return (
+            f"profiling {self.profiler.remaining} arbitration cycles "
+            f"into {self.profiler.output_dir}\n"
+        )
+
     async def consume_entities(self):
         try:
-            async for entity in self.entity_handler.stream_entities():
-                self.cache_manager.handle_response(entity)
+            async for entity in self.entity_handler.supervised_stream(self.resync):
+                self.ingest_queue.put(entity.entity_id, entity)
         except asyncio.CancelledError:
             print("Streaming cancelled...")
-        except ApiError as error:
-            print(f"Exception: {error}")
 
-    async def recon_job(self):
+    def resync(self, snapshot):
+        # Anything still queued predates the snapshot, which supersedes it.
+        self.ingest_queue.clear()
+        dropped = self.cache_manager.reconcile(snapshot)
+        if dropped:
+            self.logger.info(f"dropped {dropped} entities that vanished from Lattice")
+
+    async def ingest_entities(self):
         while True:
-            await self.arbitrate_isr()
-            await asyncio.sleep(1)
+            batch = await self.ingest_queue.get_batch()
+            for entity in batch:
+                try:
+                    self.cache_manager.handle_response(entity)
+                except Exception:
+                    # Skip the malformed entity rather than stop ingesting.
+                    self.logger.exception(f"failed to ingest entity {entity.entity_id}")
+            self.metrics.entities_ingested.inc(len(batch))
 
-    def within_range(self, asset, track) -> bool:
-        distance = DistanceCalculator.calculate(asset, track)
-        return distance <= DISTANCE_THRESHOLD_MILES
+    async def recon_job(self):
+        """Arbitrate as soon as entity updates arrive, with a periodic full rescan.
 
-    def check_in_progress(self, asset, track) -> bool:
+        Between full rescans only pairs involving entities that moved or changed
+        disposition are re-evaluated, so an idle picture costs almost nothing.
+        Full rescans run on a fixed deadline grid, so their cadence doesn't
+        drift with cycle cost. A rescan that overruns skips the deadlines it
+        missed instead of running back to back. An incremental pass that
+        wouldn't finish before the next deadline is skipped, because the
+        rescan covers the same updates.
+        """
+        loop = asyncio.get_running_loop()
+        schedule = DeadlineSchedule(self.full_rescan_interval, loop.time())
+        self.metrics.watch_schedule(schedule)
+        incremental_cost = 0.0
+        while True:
+            now = loop.time()
+            if not schedule.due(now):
+                if (
+                    self.cache_manager.updated.is_set()
+                    and schedule.remaining(now) < incremental_cost
+                ):
+                    self.metrics.skipped_passes.inc()
+                    await asyncio.sleep(schedule.remaining(now))
+                else:
+                    try:
+                        await asyncio.wait_for(
+                            self.cache_manager.updated.wait(), schedule.remaining(now)
+                        )
+                    except TimeoutError:
+                        pass
+            started = loop.time()
+            full_scan = schedule.due(started)
+            if full_scan:
+                lateness, missed = schedule.advance(started)
+                self.metrics.rescan_lateness_seconds.observe(lateness)
+                if missed:
+                    self.logger.warning(
+                        f"full rescan ran {lateness:.2f}s late, skipping {missed} missed deadlines"
+                    )
+            try:
+                await self.arbitrate_isr(full_scan)
+            except Exception:
+                # One bad pass mustn't stop arbitration; the next pass
+                # re-evaluates the same pairs.
+                self.logger.exception("arbitration pass failed")
+            if not full_scan:
+                incremental_cost += INCREMENTAL_COST_SMOOTHING * (
+                    loop.time() - started - incremental_cost
+                )
+
+    async def check_in_progress(self, asset, track) -> bool:
         skip = False
         asset_task_id = self.cache_manager.get_asset_tasks(asset.entity_id)
         if asset_task_id:
-            asset_in_progress = self.tasker.check_executing(asset_task_id)
+            asset_in_progress = await self.task_statuses.is_executing(asset_task_id)
             if asset_in_progress:
                 skip = True
             else:
                 self.cache_manager.remove_asset_task(asset.entity_id)
+                self.task_statuses.forget(asset_task_id)
+                if self.ownership:
+                    await self.release_claims([asset.entity_id])
         track_task_id = self.cache_manager.get_track_tasks(track.entity_id)
         if track_task_id:
-            track_in_progress = self.tasker.check_executing(track_task_id)
+            track_in_progress = await self.task_statuses.is_executing(track_task_id)
             if track_in_progress:
                 skip = True
             else:
                 self.cache_manager.remove_track_task(track.entity_id)
+                self.task_statuses.forget(track_task_id)
+                if self.ownership:
+                    await self.release_claims([track.entity_id])
         return skip
 
-    async def arbitrate_isr(self):
-        assets = self.cache_manager.get_assets()
-        tracks = self.cache_manager.get_tracks()
+    def held_entities(self) -> list[str]:
+        """Ids of the assets and tracks this instance has tasks in flight on."""
+        return [
+            *self.cache_manager.asset_task.cache,
+            *self.cache_manager.track_task.cache,
+        ]
+
+    async def release_claims(self, entity_ids: list[str]):
+        try:
+            await self.ownership.release(entity_ids)
+        except Exception:
+            # The claims lapse on their own once they stop being renewed.
+            self.logger.exception(f"failed to release claims on {entity_ids}")
+
+    async def settle_unowned_tasks(self):
+        """Drop finished tasks that no pair this instance arbitrates refers to.
+
+        `check_in_progress` only sees the tasks on pairs in partitions this
+        instance owns. A task on a track whose partition has moved to another
+        instance, or on an asset that has left every owned track's range,
+        would otherwise stay cached and keep its claims renewed after it ends.
+        """
+        asset_tasks = self.cache_manager.asset_task.cache
+        track_tasks = self.cache_manager.track_task.cache
+        await self.task_statuses.refresh({*asset_tasks.values(), *track_tasks.values()})
+        finished = []
+        for entity_id, task_id in list(asset_tasks.items()):
+            if not await self.task_statuses.is_executing(task_id):
+                self.cache_manager.remove_asset_task(entity_id)
+                self.task_statuses.forget(task_id)
+                finished.append(entity_id)
+        for entity_id, task_id in list(track_tasks.items()):
+            if not await self.task_statuses.is_executing(task_id):
+                self.cache_manager.remove_track_task(entity_id)
+                self.task_statuses.forget(task_id)
+                finished.append(entity_id)
+        if finished:
+            await self.release_claims(finished)
+
+    def drop_lost_claims(self, entity_ids: set[str]):
+        """Stop tracking tasks on entities whose claims another instance has taken.
+
+        The claims aren't renewed any more, and the entities are left to the
+        instance holding them; tasking them again means winning the claim back.
+        """
+        asset_tasks = self.cache_manager.asset_task.cache
+        track_tasks = self.cache_manager.track_task.cache
+        dropped = set()
+        for entity_id in entity_ids:
+            if entity_id in asset_tasks:
+                dropped.add(asset_tasks[entity_id])
+                self.cache_manager.remove_asset_task(entity_id)
+            if entity_id in track_tasks:
+                dropped.add(track_tasks[entity_id])
+                self.cache_manager.remove_track_task(entity_id)
+        # A task stays tracked while its other entity's claim is still held.
+        still_held = {*asset_tasks.values(), *track_tasks.values()}
+        for task_id in dropped - still_held:
+            self.task_statuses.forget(task_id)
+
+    def sweep_expired(self):
+        expired = self.cache_manager.sweep_expired()
+        if expired:
+            self.logger.debug(f"dropped {expired} expired entities from the cache")
+
+    def begin_full_scan(self):
+        self.sweep_expired()
+        self.cache_manager.clear_dirty()
         self.logger.info(
-            f"# of assets being tracked: {len(assets)}, # of tracks being tracked: {len(tracks)}"
+            f"# of assets being tracked: {len(self.cache_manager.assets)}, # of tracks being tracked: {len(self.cache_manager.tracks)}"
         )
-        for asset in assets:
+
+    def candidate_pairs(self, full_scan: bool) -> dict[str, tuple]:
+        """Collect the tracks near each asset that need evaluating this pass.
+
+        A full scan pairs every asset with its nearby tracks. Otherwise only the
+        dirty entities are considered: dirty assets against their nearby tracks,
+        and dirty tracks against their nearby assets.
+
+        Returns:
+            dict: asset entity_id -> (asset, {track entity_id: track}).
+        """
+        candidates = {}
+        if full_scan:
+            self.begin_full_scan()
+            assets = self.cache_manager.get_assets()
+        else:
+            self.sweep_expired()
+            assets, tracks = self.cache_manager.pop_dirty()
             for track in tracks:
-                if self.within_range(
-                    asset, track
-                ) and track.mil_view.disposition not in [
-                    "DISPOSITION_FRIENDLY",
-                    "DISPOSITION_ASSUMED_FRIENDLY",
-                ]:
-                    self.logger.info("ASSET WITHIN RANGE OF NON-FRIENDLY TRACK")
-                    if track.mil_view.disposition not in [
-                        "DISPOSITION_SUSPICIOUS",
-                        "DISPOSITION_HOSTILE",
-                    ]:
-                        await self.entity_handler.override_track_disposition(track)
-                    if self.check_in_progress(asset, track):
-                        self.logger.info("INVESTIGATION ALREADY IN PROGRESS - SKIPPING")
-                        continue
-                    if (
-                        self.cache_manager.get_asset_tasks(asset.entity_id) is None
-                        and self.cache_manager.get_track_tasks(track.entity_id) is None
-                    ):
-                        task_id = self.tasker.orbit(asset, track)
-                        self.cache_manager.add_asset_task(asset, task_id)
-                        self.cache_manager.add_track_task(track, task_id)
+                for asset in self.cache_manager.assets_near(
+                    track, DISTANCE_THRESHOLD_MILES
+                ):
+                    candidates.setdefault(asset.entity_id, (asset, {}))[1][
+                        track.entity_id
+                    ] = track
+        for asset in assets:
+            nearby = candidates.setdefault(asset.entity_id, (asset, {}))[1]
+            # The grid index narrows the tracks to those in nearby cells, so the
+            # exact range check only runs against the local neighbourhood.
+            for track in self.cache_manager.tracks_near(
+                asset, DISTANCE_THRESHOLD_MILES
+            ):
+                nearby[track.entity_id] = track
+        return candidates
+
+    def in_range_pairs(self, candidates: dict[str, tuple]) -> list[tuple]:
+        """Return the (asset, track) candidate pairs within the distance threshold."""
+        pairs = []
+        for asset, nearby in candidates.values():
+            if not nearby:
+                continue
+            self.metrics.candidate_pairs.inc(len(nearby))
+            tracks = list(nearby.values())
+            in_range = DistanceCalculator.within_range_matrix(
+                self.cache_manager.asset_positions.latlon([asset.entity_id]),
+                self.cache_manager.track_positions.latlon(nearby),
+                DISTANCE_THRESHOLD_MILES,
+            )[0]
+            pairs.extend((asset, tracks[index]) for index in np.flatnonzero(in_range))
+        self.metrics.in_range_pairs.inc(len(pairs))
+        return pairs
+
+    def predicted_pairs(self, track_ids, pairs: list[tuple]) -> list[tuple]:
+        """Return the pairs not in `pairs` whose track will enter range within the horizon.
+
+        Each moving track is projected along its velocity, and the assets within
+        reach of that path are checked for a closest approach inside the
+        threshold. Assets are taken as stationary over the horizon.
+
+        Args:
+            track_ids: Ids of the tracks to project; those no longer cached are skipped.
+            pairs: The pairs already in range this pass.
+        """
+        cached = self.cache_manager.tracks.cache
+        tracks = [
+            cached[track_id]
+            for track_id in track_ids
+            if track_id in cached and track_id in self.cache_manager.track_positions
+        ]
+        if not tracks:
+            return []
+        velocities = self.cache_manager.track_velocities(tracks)
+        lookahead = np.minimum(
+            np.hypot(velocities[:, 0], velocities[:, 1]) * self.prediction_horizon,
+            MAX_LOOKAHEAD_MILES,
+        )
+        # NaN (unknown velocity) fails the comparison, as does a stationary track.
+        moving = np.flatnonzero(lookahead > 0).tolist()
+        if not moving:
+            return []
+        track_latlon = self.cache_manager.track_positions.latlon(
+            [track.entity_id for track in tracks]
+        )
+        asset_positions = self.cache_manager.asset_positions
+        candidates = 0
+        predicted = []
+        if len(moving) > len(self.cache_manager.assets):
+            # Fewer grid queries from the asset side, at the widest reach of
+            # any moving track; the exact check drops the extras.
+            row_of = {tracks[row].entity_id: row for row in moving}
+            radius = DISTANCE_THRESHOLD_MILES + lookahead[moving].max()
+            for asset in self.cache_manager.assets.cache.values():
+                if not asset.has_position:
+                    continue
+                nearby = [
+                    row_of[track_id]
+                    for track_id in self.cache_manager.track_index.query(
+                        asset.latitude, asset.longitude, radius
+                    )
+                    if track_id in row_of
+                ]
+                if not nearby:
+                    continue
+                candidates += len(nearby)
+                entering = DistanceCalculator.enters_range(
+                    asset_positions.latlon([asset.entity_id]),
+                    track_latlon[nearby],
+                    velocities[nearby],
+                    DISTANCE_THRESHOLD_MILES,
+                    self.prediction_horizon,
+                )
+                predicted.extend(
+                    (asset, tracks[nearby[index]]) for index in np.flatnonzero(entering)
+                )
+        else:
+            for row in moving:
+                track = tracks[row]
+                nearby = self.cache_manager.assets_near(
+                    track, DISTANCE_THRESHOLD_MILES + lookahead[row]
+                )
+                if not nearby:
+                    continue
+                candidates += len(nearby)
+                entering = DistanceCalculator.enters_range(
+                    asset_positions.latlon([asset.entity_id for asset in nearby]),
+                    track_latlon[[row]],
+                    velocities[[row]],
+                    DISTANCE_THRESHOLD_MILES,
+                    self.prediction_horizon,
+                )
+                predicted.extend(
+                    (nearby[index], track) for index in np.flatnonzero(entering)
+                )
+        self.metrics.candidate_pairs.inc(candidates)
+        # A pair already in range also passes the projection; keep only new ones.
+        seen = {(asset.entity_id, track.entity_id) for asset, track in pairs}
+        predicted = [
+            (asset, track)
+            for asset, track in predicted
+            if (asset.entity_id, track.entity_id) not in seen
+        ]
+        self.metrics.predicted_pairs.inc(len(predicted))
+        return predicted
+
+    async def sharded_pairs(self) -> list[tuple]:
+        """Return every in-range (asset, track) pair, range-checked in the shard pool.
+
+        The full-scan equivalent of `in_range_pairs(candidate_pairs(True))`.
+        Only positions go to the workers; their rows are mapped back to the
+        cached entities here.
+        """
+        self.begin_full_scan()
+        asset_positions = self.cache_manager.asset_positions
+        track_positions = self.cache_manager.track_positions
+        # Ingestion carries on while the workers run, so resolve rows against
+        # the ids as they were when the positions were taken.
+        asset_ids = list(asset_positions.ids)
+        track_ids = list(track_positions.ids)
+        asset_rows, track_rows, candidates = await self.shards.in_range(
+            asset_positions.latlon(), track_positions.latlon()
+        )
+        self.metrics.candidate_pairs.inc(candidates)
+        assets = self.cache_manager.assets.cache
+        tracks = self.cache_manager.tracks.cache
+        pairs = []
+        for asset_row, track_row in zip(asset_rows.tolist(), track_rows.tolist()):
+            asset = assets.get(asset_ids[asset_row])
+            track = tracks.get(track_ids[track_row])
+            # Either may have left the cache since.
+            if asset is not None and track is not None:
+                pairs.append((asset, track))
+        self.metrics.in_range_pairs.inc(len(pairs))
+        return pairs
+
+    async def arbitrate_isr(self, full_scan: bool = True):
+        with (
+            self.profiler.cycle(),
+            self.metrics.cycle_seconds.time(
+                scan="full" if full_scan else "incremental"
+            ),
+        ):
+            await self._arbitrate_isr(full_scan)
+
+    async def _arbitrate_isr(self, full_scan: bool):
+        if self.prediction_horizon:
+            # Taken before the pass clears the dirty set. An incremental pass
+            # only projects the tracks that moved since the last one.
+            moving = list(
+                self.cache_manager.track_history.ids
+                if full_scan
+                else self.cache_manager.dirty_tracks
+            )
+        if full_scan and self.shards:
+            pairs = await self.sharded_pairs()
+        else:
+            pairs = self.in_range_pairs(self.candidate_pairs(full_scan))
+        if self.prediction_horizon:
+            pairs += self.predicted_pairs(moving, pairs)
+        if self.ownership:
+            pairs = [pair for pair in pairs if self.ownership.owns(pair[1].entity_id)]
+        # Fetch every task status this pass will consult up front, concurrently
+        # and once per task, rather than once per pair that references it.
+        task_ids = set()
+        for asset, track in pairs:
+            task_ids.add(self.cache_manager.get_asset_tasks(asset.entity_id))
+            task_ids.add(self.cache_manager.get_track_tasks(track.entity_id))
+        task_ids.discard(None)
+        await self.task_statuses.refresh(task_ids)
+        overrides, assignments = await self.plan(pairs)
+        # Overrides are written behind in the background; arbitration never
+        # waits on them.
+        for track in overrides:
+            self.overrides.submit(track)
+        # Independent task creations go out in parallel; the shared semaphore
+        # bounds how many are in flight.
+        await asyncio.gather(
+            *(self.dispatch_orbit(asset, track) for asset, track in assignments),
+            return_exceptions=True,
+        )
+        if full_scan:
+            if self.ownership:
+                await self.settle_unowned_tasks()
+            self.overrides.prune()
+            self.logger.debug(
+                f"task status cache hits: {self.task_statuses.hits}, misses: {self.task_statuses.misses}"
+            )
+            self.logger.debug(
+                f"overrides sent: {self.overrides.sent}, coalesced: {self.overrides.coalesced}, failed: {self.overrides.failed}"
+            )
+            self.logger.debug(f"cache stats: {self.cache_manager.stats()}")
+            self.logger.debug(
+                f"entity stream reconnects: {self.entity_handler.reconnects}, resyncs: {self.entity_handler.resyncs}, downtime: {self.entity_handler.downtime_seconds:.1f}s, filtered: {self.entity_handler.filtered}"
+            )
+            self.logger.debug(
+                f"ingest queue depth: {len(self.ingest_queue)}, coalesced: {self.ingest_queue.coalesced}, dropped: {self.ingest_queue.dropped}"
+            )
+
+    async def plan(self, pairs: list[tuple]) -> tuple[list, list[tuple]]:
+        """Decide which tracks need a disposition override and which pairs to task.
+
+        Pairs whose asset or track is already investigating are dropped; the
+        rest are matched by the configured assignment mode. Each asset and track
+        is claimed by at most one new task per pass, so the orbit requests can
+        be dispatched concurrently without conflicting.
+
+        Returns:
+            tuple: (tracks to override, (asset, track) pairs to task).
+        """
+        overrides = {}
+        eligible = []
+        for asset, track in pairs:
+            if track.disposition in [
+                "DISPOSITION_FRIENDLY",
+                "DISPOSITION_ASSUMED_FRIENDLY",
+            ]:
+                continue
+            self.logger.info("ASSET WITHIN RANGE OF NON-FRIENDLY TRACK")
+            if track.disposition not in [
+                "DISPOSITION_SUSPICIOUS",
+                "DISPOSITION_HOSTILE",
+            ]:
+                overrides[track.entity_id] = track
+            if await self.check_in_progress(asset, track):
+                self.logger.info("INVESTIGATION ALREADY IN PROGRESS - SKIPPING")
+                continue
+            eligible.append((asset, track))
+        if self.assignment_mode == "optimal":
+            assignments = AssignmentSolver.optimal(
+                eligible,
+                self.priority_weight_miles,
+                self.cache_manager.asset_positions,
+                self.cache_manager.track_positions,
+            )
+        else:
+            assignments = AssignmentSolver.greedy(eligible)
+        return list(overrides.values()), assignments
+
+    async def dispatch_orbit(self, asset, track):
+        # Tasker logs and re-raises failures; arbitrate_isr's gather absorbs them
+        # and the pair is picked up again on a later pass.
+        # The track is claimed too: its partition may have changed hands while
+        # a task from the previous owner is still investigating it.
+        claims = [asset.entity_id, track.entity_id]
+        if self.ownership and not await self.ownership.claim(claims):
+            self.logger.info(
+                f"asset {asset.entity_id} or track {track.entity_id} is claimed by another instance - skipping"
+            )
+            return
+        try:
+            task_id = await self.tasker.orbit(asset, track)
+        except Exception:
+            if self.ownership:
+                await self.release_claims(claims)
+            raise
+        self.cache_manager.add_asset_task(asset, task_id)
+        self.cache_manager.add_track_task(track, task_id)
+        if self.task_store:
+            self.task_store.record_created(task_id, asset.entity_id, track.entity_id)
@@ -1,42 +1,282 @@
+import asyncio
+import time
+from collections.abc import Callable
+
+import numpy as np
 from anduril import Entity
+from utils.entity_record import EntityRecord
+from utils.expiring_cache import ExpiringCache
 from utils.lru_cache import LRUCache
+from utils.position_store import PositionStore
+from utils.spatial_index import SpatialGrid
+from utils.track_history import DEFAULT_TRACK_HISTORY_DEPTH, TrackHistory
+
+# Default grid cell size; the Arbiter sizes cells to its range threshold.
+DEFAULT_INDEX_CELL_MILES = 5
+
+# Default capacity of each map. Entities also leave the cache when their
+# expiry_time passes, so these only bound memory under heavy load.
+DEFAULT_ASSET_CAPACITY = 1000
+DEFAULT_TRACK_CAPACITY = 10000
+DEFAULT_ASSET_TASK_CAPACITY = 1000
+DEFAULT_TRACK_TASK_CAPACITY = 1000
+
+METERS_PER_MILE = 1609.344
 
 
 class CacheManager:
-    def __init__(self, capacity: int = 150):
-        self.assets = LRUCache(capacity)
-        self.tracks = LRUCache(capacity)
-        self.asset_task = LRUCache(capacity)
-        self.track_task = LRUCache(capacity)
+    def __init__(
+        self,
+        asset_capacity: int = DEFAULT_ASSET_CAPACITY,
+        track_capacity: int = DEFAULT_TRACK_CAPACITY,
+        asset_task_capacity: int = DEFAULT_ASSET_TASK_CAPACITY,
+        track_task_capacity: int = DEFAULT_TRACK_TASK_CAPACITY,
+        index_cell_miles: float = DEFAULT_INDEX_CELL_MILES,
+        track_history_depth: int = DEFAULT_TRACK_HISTORY_DEPTH,
+        on_task_evicted: Callable[[str], None] | None = None,
+    ):
+        self.asset_index = SpatialGrid(index_cell_miles)
+        self.track_index = SpatialGrid(index_cell_miles)
+        # Positions kept as contiguous arrays alongside the cached entities.
+        self.asset_positions = PositionStore()
+        self.track_positions = PositionStore()
+        # Recent positions of each track, for estimating where it is heading.
+        self.track_history = TrackHistory(track_history_depth)
+        self.assets = ExpiringCache(
+            asset_capacity,
+            on_evict=lambda entity_id, _: self._unindex(
+                self.asset_index, self.asset_positions, entity_id
+            ),
+        )
+        self.tracks = ExpiringCache(
+            track_capacity,
+            on_evict=lambda entity_id, _: self._unindex_track(entity_id),
+        )
+        # Called with a task id once capacity evictions have dropped it from
+        # both task maps, so whoever persists tasks can forget it too.
+        self.on_task_evicted = on_task_evicted
+        self.asset_task = LRUCache(
+            asset_task_capacity,
+            on_evict=lambda _, task_id: self._task_evicted(task_id, self.track_task),
+        )
+        self.track_task = LRUCache(
+            track_task_capacity,
+            on_evict=lambda _, task_id: self._task_evicted(task_id, self.asset_task),
+        )
+        # Ids of entities whose position or disposition changed since the last
+        # arbitration pass (dicts used as insertion-ordered sets), and an event
+        # set whenever one is marked so the arbiter can wake immediately.
+        self.dirty_assets: dict[str, None] = {}
+        self.dirty_tracks: dict[str, None] = {}
+        self.updated = asyncio.Event()
 
-    def add_asset(self, entity: Entity):
+    def add_asset(self, entity: EntityRecord):
         entity_id = entity.entity_id
-        self.assets.put(entity_id, entity)
+        self.assets.put(entity_id, entity, entity.expiry_time)
+        self._index(self.asset_index, self.asset_positions, entity)
 
-    def add_track(self, entity: Entity):
+    def add_track(self, entity: EntityRecord):
         entity_id = entity.entity_id
-        self.tracks.put(entity_id, entity)
+        self.tracks.put(entity_id, entity, entity.expiry_time)
+        self._index(self.track_index, self.track_positions, entity)
+        if entity.has_position:
+            update_time = entity.source_update_time
+            self.track_history.record(
+                entity_id,
+                update_time.timestamp() if update_time else time.time(),
+                entity.latitude,
+                entity.longitude,
+            )
+        else:
+            self.track_history.remove(entity_id)
+
+    @classmethod
+    def _index(cls, index: SpatialGrid, positions: PositionStore, entity: EntityRecord):
+        if not entity.has_position:
+            cls._unindex(index, positions, entity.entity_id)
+            return
+        index.update(entity.entity_id, entity.latitude, entity.longitude)
+        positions.update(
+            entity.entity_id,
+            entity.latitude,
+            entity.longitude,
+            entity.altitude if entity.altitude is not None else float("nan"),
+        )
+
+    @staticmethod
+    def _unindex(index: SpatialGrid, positions: PositionStore, entity_id: str):
+        index.remove(entity_id)
+        positions.remove(entity_id)
+
+    def remove_asset(self, entity_id: str):
+        self.assets.remove(entity_id)
+        self._unindex(self.asset_index, self.asset_positions, entity_id)
+
+    def _unindex_track(self, entity_id: str):
+        self._unindex(self.track_index, self.track_positions, entity_id)
+        self.track_history.remove(entity_id)
+
+    def remove_track(self, entity_id: str):
+        self.tracks.remove(entity_id)
+        self._unindex_track(entity_id)
+
+    def track_velocities(self, tracks: list[EntityRecord]) -> np.ndarray:
+        """Return an (N, 2) array of (east, north) miles per second for each track.
+
+        A velocity the track reports itself is used as is; otherwise it is
+        estimated from the track's position history. Rows are NaN for tracks
+        with neither.
+        """
+        velocities = self.track_history.velocities(
+            [track.entity_id for track in tracks]
+        )
+        for row, track in enumerate(tracks):
+            if track.has_velocity:
+                velocities[row] = (
+                    track.velocity_east / METERS_PER_MILE,
+                    track.velocity_north / METERS_PER_MILE,
+                )
+        return velocities
+
+    def reconcile(self, entities: list[Entity]) -> int:
+        """Load a full snapshot of entities and drop cached ones it doesn't contain.
+
+        Returns:
+            int: The number of cached assets and tracks that were dropped.
+        """
+        for entity in entities:
+            self.handle_response(entity)
+        live_ids = {
+            entity.entity_id for entity in entities if entity.is_live is not False
+        }
+        vanished_assets = [
+            entity_id for entity_id in self.assets.cache if entity_id not in live_ids
+        ]
+        vanished_tracks = [
+            entity_id for entity_id in self.tracks.cache if entity_id not in live_ids
+        ]
+        for entity_id in vanished_assets:
+            self.remove_asset(entity_id)
+        for entity_id in vanished_tracks:
+            self.remove_track(entity_id)
+        return len(vanished_assets) + len(vanished_tracks)
 
-    def add_asset_task(self, entity: Entity, task_id: str):
+    def sweep_expired(self) -> int:
+        """Drop every cached asset and track whose expiry_time has passed."""
+        now = time.time()
+        return self.assets.sweep(now) + self.tracks.sweep(now)
+
+    def stats(self) -> dict:
+        """Size, eviction and expiry counters for each cached map."""
+        return {
+            name: {
+                "size": len(cache),
+                "capacity": cache.capacity,
+                "evictions": cache.evictions,
+                "expirations": getattr(cache, "expirations", 0),
+            }
+            for name, cache in (
+                ("assets", self.assets),
+                ("tracks", self.tracks),
+                ("asset_tasks", self.asset_task),
+                ("track_tasks", self.track_task),
+            )
+        }
+
+    def add_asset_task(self, entity: EntityRecord, task_id: str):
         entity_id = entity.entity_id
         self.asset_task.put(entity_id, task_id)
 
-    def add_track_task(self, entity: Entity, task_id: str):
+    def add_track_task(self, entity: EntityRecord, task_id: str):
         entity_id = entity.entity_id
         self.track_task.put(entity_id, task_id)
 
+    def _task_evicted(self, task_id: str, other: LRUCache):
+        # A task is in both maps, under its asset and its track; it is only
+        # gone once neither holds it. Evictions are rare, so a scan will do.
+        if self.on_task_evicted and task_id not in other.cache.values():
+            self.on_task_evicted(task_id)
+
+    def restore_task(self, asset_id: str, track_id: str, task_id: str):
+        self.asset_task.put(asset_id, task_id)
+        self.track_task.put(track_id, task_id)
+
     def remove_asset_task(self, entity_id: str):
         self.asset_task.remove(entity_id)
 
     def remove_track_task(self, entity_id: str):
         self.track_task.remove(entity_id)
 
-    def get_assets(self) -> list[Entity]:
+    def get_assets(self) -> list[EntityRecord]:
         return self.assets.get_all()
 
-    def get_tracks(self) -> list[Entity]:
+    def get_tracks(self) -> list[EntityRecord]:
         return self.tracks.get_all()
 
+    def tracks_near(
+        self, asset: EntityRecord, radius_miles: float
+    ) -> list[EntityRecord]:
+        """Return the cached tracks in grid cells within `radius_miles` of `asset`.
+
+        This is a coarse candidate set; callers still apply an exact range check.
+        """
+        return self._near(self.track_index, self.tracks, asset, radius_miles)
+
+    def assets_near(
+        self, track: EntityRecord, radius_miles: float
+    ) -> list[EntityRecord]:
+        """Return the cached assets in grid cells within `radius_miles` of `track`."""
+        return self._near(self.asset_index, self.assets, track, radius_miles)
+
+    @staticmethod
+    def _near(
+        index: SpatialGrid, cache: LRUCache, entity: EntityRecord, radius_miles: float
+    ) -> list[EntityRecord]:
+        if not entity.has_position:
+            return []
+        entity_ids = index.query(entity.latitude, entity.longitude, radius_miles)
+        # Read straight from the backing dict so a range query doesn't reorder the LRU.
+        return [cache.cache[entity_id] for entity_id in entity_ids]
+
+    def pop_dirty(self) -> tuple[list[EntityRecord], list[EntityRecord]]:
+        """Return the still-cached dirty assets and tracks, and clear the dirty set."""
+        assets = [
+            self.assets.cache[entity_id]
+            for entity_id in self.dirty_assets
+            if entity_id in self.assets.cache
+        ]
+        tracks = [
+            self.tracks.cache[entity_id]
+            for entity_id in self.dirty_tracks
+            if entity_id in self.tracks.cache
+        ]
+        self.clear_dirty()
+        return assets, tracks
+
+    def clear_dirty(self):
+        self.dirty_assets.clear()
+        self.dirty_tracks.clear()
+        self.updated.clear()
+
+    def _mark_if_changed(self, cache: LRUCache, dirty: dict, entity: EntityRecord):
+        """Mark `entity` dirty if it is new or has moved or changed disposition.
+
+        Lattice republishes entities periodically even when nothing about them
+        changed; those refreshes leave the arbitration outcome unchanged, so
+        they don't need to wake the arbiter.
+        """
+        previous = cache.cache.get(entity.entity_id)
+        if previous is not None and self._arbitration_key(
+            previous
+        ) == self._arbitration_key(entity):
+            return
+        dirty[entity.entity_id] = None
+        self.updated.set()
+
+    @staticmethod
+    def _arbitration_key(entity: EntityRecord) -> tuple:
+        return (entity.latitude, entity.longitude, entity.disposition)
+
     def get_asset_tasks(self, entity_id: str):
         return self.asset_task.get(entity_id)
 
@@ -44,12 +284,22 @@ class CacheManager:
         return self.track_task.get(entity_id)
 
     def handle_response(self, entity: Entity):
-        ontology_template = entity.ontology.template
-        mil_view_disposition = entity.mil_view.disposition
+        if entity.is_live is False:
+            # The entity was deleted from Lattice; stop arbitrating over it.
+            # Deletions may arrive stripped of everything but the id.
+            self.remove_asset(entity.entity_id)
+            self.remove_track(entity.entity_id)
+            return
+        ontology_template = entity.ontology.template if entity.ontology else None
+        mil_view_disposition = entity.mil_view.disposition if entity.mil_view else None
         if ontology_template == "TEMPLATE_ASSET":
-            self.add_asset(entity)
+            record = EntityRecord.from_entity(entity)
+            self._mark_if_changed(self.assets, self.dirty_assets, record)
+            self.add_asset(record)
         elif (
             ontology_template == "TEMPLATE_TRACK"
             and mil_view_disposition != "DISPOSITION_FRIENDLY"
         ):
-            self.add_track(entity)
+            record = EntityRecord.from_entity(entity)
+            self._mark_if_changed(self.tracks, self.dirty_tracks, record)
+            self.add_track(record)
@@ -0,0 +1,206 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Coordinator(ABC):
+    """Shared state the recon instances use to divide work between them.
+
+    Instances register as members with `heartbeat`, hold renewable leases on
+    track partitions, and claim the asset and track of a task before creating
+    it, holding both claims until the task finishes. Every lease and
+    claim carries an expiry, so an instance that dies without releasing its
+    work loses it after one lease period. Backends implement these methods
+    atomically for concurrent callers in other processes.
+    """
+
+    @abstractmethod
+    def heartbeat(self, instance_id: str, lease_seconds: float) -> list[str]:
+        """Renew `instance_id`'s membership and return the live members, sorted."""
+
+    @abstractmethod
+    def renew_leases(
+        self, instance_id: str, partitions: set[int], lease_seconds: float
+    ) -> set[int]:
+        """Acquire or renew leases on `partitions` and give up any others held.
+
+        A partition is only acquired if it is free or its lease has expired.
+
+        Returns:
+            set: The partitions `instance_id` now holds.
+        """
+
+    @abstractmethod
+    def claim_entities(
+        self, instance_id: str, entity_ids: list[str], lease_seconds: float
+    ) -> set[str]:
+        """Claim or renew claims on entities, unless another live instance holds them.
+
+        Returns:
+            set: The entity ids `instance_id` now holds.
+        """
+
+    @abstractmethod
+    def release_entities(self, instance_id: str, entity_ids: list[str]):
+        """Drop `instance_id`'s claims on `entity_ids`."""
+
+    @abstractmethod
+    def release_all(self, instance_id: str):
+        """Drop every lease, claim and membership held by `instance_id`."""
+
+
+class SqliteCoordinator(Coordinator):
+    """Coordinator backed by a SQLite database shared by instances on one host
+    or on a shared filesystem that supports file locking.
+
+    Each operation is a single IMMEDIATE transaction, so it holds the write
+    lock for its whole read-modify-write. Expiries are compared against
+    wall-clock time, so hosts sharing a database need synchronised clocks.
+    """
+
+    def __init__(self, path: str, busy_timeout_seconds: float = 5):
+        self.connection = sqlite3.connect(
+            path,
+            timeout=busy_timeout_seconds,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        # The connection is shared by whichever executor thread runs a call.
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS members (
+                    instance_id TEXT PRIMARY KEY,
+                    expires REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS partition_leases (
+                    partition INTEGER PRIMARY KEY,
+                    instance_id TEXT NOT NULL,
+                    expires REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS claims (
+                    entity_id TEXT PRIMARY KEY,
+                    instance_id TEXT NOT NULL,
+                    expires REAL NOT NULL
+                );
+                """
+            )
+
+    def _transaction(self, operation):
+        with self.lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(self.connection, time.time())
+            except BaseException:
+                self.connection.execute("ROLLBACK")
+                raise
+            self.connection.execute("COMMIT")
+            return result
+
+    def heartbeat(self, instance_id: str, lease_seconds: float) -> list[str]:
+        def operation(connection, now):
+            connection.execute("DELETE FROM members WHERE expires < ?", (now,))
+            connection.execute(
+                "INSERT INTO members (instance_id, expires) VALUES (?, ?) "
+                "ON CONFLICT (instance_id) DO UPDATE SET expires = excluded.expires",
+                (instance_id, now + lease_seconds),
+            )
+            return [
+                row[0]
+                for row in connection.execute(
+                    "SELECT instance_id FROM members ORDER BY instance_id"
+                )
+            ]
+
+        return self._transaction(operation)
+
+    @staticmethod
+    def _acquire(connection, table, column, key, instance_id, expires, now):
+        """Take or renew a lease row unless another instance holds it unexpired."""
+        connection.execute(
+            f"INSERT INTO {table} VALUES (?, ?, ?) "
+            f"ON CONFLICT ({column}) DO UPDATE SET instance_id = excluded.instance_id, "
+            f"expires = excluded.expires "
+            f"WHERE {table}.instance_id = excluded.instance_id OR {table}.expires < ?",
+            (key, instance_id, expires, now),
+        )
+
+    def renew_leases(
+        self, instance_id: str, partitions: set[int], lease_seconds: float
+    ) -> set[int]:
+        def operation(connection, now):
+            held = {
+                row[0]
+                for row in connection.execute(
+                    "SELECT partition FROM partition_leases WHERE instance_id = ?",
+                    (instance_id,),
+                )
+            }
+            connection.executemany(
+                "DELETE FROM partition_leases WHERE partition = ? AND instance_id = ?",
+                [(partition, instance_id) for partition in held - partitions],
+            )
+            for partition in partitions:
+                self._acquire(
+                    connection,
+                    "partition_leases",
+                    "partition",
+                    partition,
+                    instance_id,
+                    now + lease_seconds,
+                    now,
+                )
+            return {
+                row[0]
+                for row in connection.execute(
+                    "SELECT partition FROM partition_leases WHERE instance_id = ?",
+                    (instance_id,),
+                )
+            }
+
+        return self._transaction(operation)
+
+    def claim_entities(
+        self, instance_id: str, entity_ids: list[str], lease_seconds: float
+    ) -> set[str]:
+        def operation(connection, now):
+            held = set()
+            for entity_id in entity_ids:
+                self._acquire(
+                    connection,
+                    "claims",
+                    "entity_id",
+                    entity_id,
+                    instance_id,
+                    now + lease_seconds,
+                    now,
+                )
+                row = connection.execute(
+                    "SELECT instance_id FROM claims WHERE entity_id = ?",
+                    (entity_id,),
+                ).fetchone()
+                if row[0] == instance_id:
+                    held.add(entity_id)
+            return held
+
+        return self._transaction(operation)
+
+    def release_entities(self, instance_id: str, entity_ids: list[str]):
+        self._transaction(
+            lambda connection, now: connection.executemany(
+                "DELETE FROM claims WHERE entity_id = ? AND instance_id = ?",
+                [(entity_id, instance_id) for entity_id in entity_ids],
+            )
+        )
+
+    def release_all(self, instance_id: str):
+        def operation(connection, now):
+            for table in ("members", "partition_leases", "claims"):
+                connection.execute(
+                    f"DELETE FROM {table} WHERE instance_id = ?", (instance_id,)
+                )
+
+        self._transaction(operation)
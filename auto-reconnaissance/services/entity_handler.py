@@ -1,9 +1,94 @@
 import asyncio
+import time
+import typing
+from collections.abc import Callable
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from logging import Logger
 
-from anduril import AsyncLattice, Entity, MilView, Provenance
+from anduril import (
+    AndOperation,
+    AsyncLattice,
+    Entity,
+    EnumType,
+    MilView,
+    NotOperation,
+    OrOperation,
+    Predicate,
+    Provenance,
+    Statement,
+    StatementSet,
+    Value,
+)
 from anduril.core import ApiError
+from anduril.types.mil_view_disposition import MilViewDisposition
+from anduril.types.ontology_template import OntologyTemplate
+from services.recon_metrics import ReconMetrics
+from utils.backoff import Backoff
+from utils.endpoint import lattice_base_url
+from utils.entity_record import EntityRecord
+
+# Reconnect delays for the entity stream (jittered, doubling up to the max).
+STREAM_BACKOFF_INITIAL_SECONDS = 1
+STREAM_BACKOFF_MAX_SECONDS = 60
+
+# Entity components the arbiter reads; everything else is left off the stream.
+STREAM_COMPONENTS = ("location", "mil_view", "ontology", "provenance")
+
+
+def enum_numbers(sdk_enum) -> dict[str, int]:
+    """Map an SDK enum's names to the integers a stream filter compares against.
+
+    The filter takes proto enum numbers. The SDK lists each enum's literals
+    in proto order, starting from the zero value, so a name's position is its
+    number.
+    """
+    return {
+        name: number
+        for number, name in enumerate(typing.get_args(typing.get_args(sdk_enum)[0]))
+    }
+
+
+_TEMPLATES = enum_numbers(OntologyTemplate)
+_DISPOSITIONS = enum_numbers(MilViewDisposition)
+
+
+def _enum_equals(field_path: str, value: int) -> Predicate:
+    return Predicate(
+        field_path=field_path,
+        value=Value(enum_type=EnumType(value=value)),
+        comparator="COMPARATOR_EQUALITY",
+    )
+
+
+def build_stream_filter() -> Statement:
+    """Server-side equivalent of `EntityHandler.filter_entity`: assets, or non-friendly tracks."""
+    is_asset = Statement(
+        predicate=_enum_equals("ontology.template", _TEMPLATES["TEMPLATE_ASSET"])
+    )
+    is_track = Statement(
+        predicate=_enum_equals("ontology.template", _TEMPLATES["TEMPLATE_TRACK"])
+    )
+    is_friendly = Statement(
+        predicate=_enum_equals(
+            "mil_view.disposition", _DISPOSITIONS["DISPOSITION_FRIENDLY"]
+        )
+    )
+    non_friendly_track = Statement(
+        and_=AndOperation(
+            statement_set=StatementSet(
+                statements=[
+                    is_track,
+                    Statement(not_=NotOperation(statement=is_friendly)),
+                ]
+            )
+        )
+    )
+    return Statement(
+        or_=OrOperation(
+            statement_set=StatementSet(statements=[is_asset, non_friendly_track])
+        )
+    )
 
 
 class EntityHandler:
@@ -14,14 +99,27 @@ class EntityHandler:
         client_id: str,
         client_secret: str,
         sandboxes_token: str | None = None,
+        concurrency: asyncio.Semaphore | None = None,
+        metrics: ReconMetrics | None = None,
     ):
         self.logger = logger
+        # Bounds concurrent Lattice calls; shared with the Tasker by the Arbiter.
+        # None leaves calls unbounded.
+        self.concurrency = concurrency or nullcontext()
+        self.metrics = metrics or ReconMetrics()
         self.client = AsyncLattice(
-            base_url=f"https://{lattice_endpoint}",
+            base_url=lattice_base_url(lattice_endpoint),
             client_id=client_id,
             client_secret=client_secret,
             headers={"anduril-sandbox-authorization": f"Bearer {sandboxes_token}"},
         )
+        # Health of the supervised entity stream.
+        self.reconnects = 0
+        self.resyncs = 0
+        self.downtime_seconds = 0.0
+        # Entities dropped by `filter_entity` after reaching us.
+        self.filtered = 0
+        self.stream_filter = build_stream_filter()
 
     def filter_entity(self, entity: Entity) -> bool:
         """
@@ -36,22 +134,89 @@ class EntityHandler:
         Raises:
             None
         """
-        ontology_template = entity.ontology.template
-        mil_view_disposition = entity.mil_view.disposition
+        ontology_template = entity.ontology.template if entity.ontology else None
+        mil_view_disposition = entity.mil_view.disposition if entity.mil_view else None
         return bool(ontology_template == "TEMPLATE_ASSET" or ontology_template == "TEMPLATE_TRACK" and mil_view_disposition != "DISPOSITION_FRIENDLY")
 
-    async def stream_entities(self):
-        try:
-            event_stream = self.client.entities.stream_entities(pre_existing_only=False)
-            async for event in event_stream:
-                if event.event == "entity" and event.entity is not None:
-                    yield event.entity
-        except asyncio.CancelledError:
-            print("Streaming cancelled...")
-        except ApiError as error:
-            print(f"Exception: {error}")
+    async def stream_entities(self, pre_existing_only: bool = False):
+        """Stream entity updates, asking Lattice for only the entities and components we use.
+
+        Entities that still slip past the server-side filter are rejected here,
+        before they are queued or projected into the cache. A rejected track
+        (one that turned friendly) is surfaced as a deletion so a stale copy
+        doesn't linger in the cache.
+        """
+        event_stream = self.client.entities.stream_entities(
+            pre_existing_only=pre_existing_only,
+            components_to_include=STREAM_COMPONENTS,
+            filter=self.stream_filter,
+        )
+        async for event in event_stream:
+            if event.event != "entity" or event.entity is None:
+                continue
+            entity = event.entity
+            if event.event_type == "EVENT_TYPE_DELETED":
+                # Surface deletions as non-live entities so the cache drops them.
+                yield entity.model_copy(update={"is_live": False})
+            elif self.filter_entity(entity):
+                yield entity
+            else:
+                self.filtered += 1
+                if entity.ontology and entity.ontology.template == "TEMPLATE_TRACK":
+                    yield entity.model_copy(update={"is_live": False})
 
-    async def override_track_disposition(self, track: Entity):
+    async def snapshot_entities(self) -> list[Entity]:
+        """Fetch every pre-existing entity in one pass that ends when the snapshot does."""
+        return [entity async for entity in self.stream_entities(pre_existing_only=True)]
+
+    async def supervised_stream(self, on_resync: Callable[[list[Entity]], None]):
+        """Stream entities forever, reconnecting with jittered exponential backoff.
+
+        Every (re)connection starts with a snapshot of the pre-existing entities,
+        handed to `on_resync` so the caller can reconcile its cache and drop
+        entities that vanished while we were disconnected, before live updates
+        are yielded. Reconnect and resync counts and the total time spent
+        disconnected are kept on the handler.
+        """
+        backoff = Backoff(STREAM_BACKOFF_INITIAL_SECONDS, STREAM_BACKOFF_MAX_SECONDS)
+        disconnected_at = None
+        while True:
+            try:
+                # Errors are counted below, under the stream as a whole.
+                with self.metrics.lattice_call_seconds.time(
+                    endpoint="stream_entities_snapshot"
+                ):
+                    snapshot = await self.snapshot_entities()
+                on_resync(snapshot)
+                self.resyncs += 1
+                if disconnected_at is not None:
+                    self.downtime_seconds += time.monotonic() - disconnected_at
+                    disconnected_at = None
+                backoff.reset()
+                self.logger.info(f"entity stream synced {len(snapshot)} entities")
+                # The live stream opens by replaying every pre-existing entity.
+                # The replay is ingested too, since it carries any change made
+                # between the snapshot and the stream opening. An entity that
+                # hasn't changed doesn't mark the cache dirty, so the replay
+                # costs ingestion but no extra arbitration.
+                async for entity in self.stream_entities():
+                    yield entity
+                self.logger.warning("entity stream closed by server")
+            except ApiError as error:
+                self.metrics.lattice_call_errors.inc(endpoint="stream_entities")
+                self.logger.error(f"lattice api stream entities error {error}")
+            except Exception:
+                self.metrics.lattice_call_errors.inc(endpoint="stream_entities")
+                self.logger.exception("entity stream failed")
+            if disconnected_at is None:
+                disconnected_at = time.monotonic()
+            delay = backoff.next_delay()
+            self.reconnects += 1
+            self.logger.info(f"reconnecting entity stream in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def override_track_disposition(self, track: EntityRecord) -> bool:
+        """Override `track`'s disposition to suspicious. Returns True if Lattice accepted it."""
         try:
             self.logger.info(f"overriding disposition for track {track.entity_id}")
             entity_id = track.entity_id
@@ -60,18 +225,21 @@ class EntityHandler:
                 mil_view=MilView(disposition="DISPOSITION_SUSPICIOUS"),
             )
             override_provenance = Provenance(
-                integration_name=track.provenance.integration_name,
-                data_type=track.provenance.data_type,
-                source_id=track.provenance.source_id,
+                integration_name=track.integration_name,
+                data_type=track.data_type,
+                source_id=track.source_id,
                 source_update_time=datetime.now(timezone.utc),
-                source_description=track.provenance.source_description,
-            )
-            await self.client.entities.override_entity(
-                entity_id=entity_id,
-                field_path="mil_view.disposition",
-                entity=override_track_entity,
-                provenance=override_provenance,
+                source_description=track.source_description,
             )
-            return
+            async with self.concurrency:
+                with self.metrics.lattice_call("override_entity"):
+                    await self.client.entities.override_entity(
+                        entity_id=entity_id,
+                        field_path="mil_view.disposition",
+                        entity=override_track_entity,
+                        provenance=override_provenance,
+                    )
+            return True
         except ApiError as error:
             self.logger.error(f"lattice api stream entities error {error}")
+            return False
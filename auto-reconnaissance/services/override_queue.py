@@ -0,0 +1,76 @@
+import asyncio
+import time
+from logging import Logger
+
+from services.entity_handler import EntityHandler
+from utils.entity_record import EntityRecord
+
+# How long an applied override suppresses resending for the same track. The
+# stream normally echoes the new disposition well within this window; if it
+# hasn't by then, the override is sent again.
+DEFAULT_OVERRIDE_COOLDOWN_SECONDS = 30.0
+
+
+class OverrideQueue:
+    """Write-behind queue for track disposition overrides.
+
+    `submit` returns immediately; the override is sent from a background task.
+    Submissions are coalesced by track id: a track with an override in flight,
+    or one applied within the cooldown, is not sent again. Counters record how
+    many submissions were sent, coalesced, and failed.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        entity_handler: EntityHandler,
+        cooldown_seconds: float = DEFAULT_OVERRIDE_COOLDOWN_SECONDS,
+    ):
+        self.logger = logger
+        self.entity_handler = entity_handler
+        self.cooldown_seconds = cooldown_seconds
+        # track entity_id -> background task sending its override
+        self.in_flight: dict[str, asyncio.Task] = {}
+        # track entity_id -> monotonic time its override was applied
+        self.applied: dict[str, float] = {}
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def submit(self, track: EntityRecord):
+        entity_id = track.entity_id
+        applied_at = self.applied.get(entity_id)
+        if entity_id in self.in_flight or (
+            applied_at is not None
+            and time.monotonic() - applied_at < self.cooldown_seconds
+        ):
+            self.coalesced += 1
+            return
+        self.in_flight[entity_id] = asyncio.create_task(self._send(track))
+
+    async def _send(self, track: EntityRecord):
+        entity_id = track.entity_id
+        try:
+            applied = await self.entity_handler.override_track_disposition(track)
+        except Exception:
+            self.logger.exception(f"override for track {entity_id} failed")
+            applied = False
+        finally:
+            del self.in_flight[entity_id]
+        if applied:
+            self.sent += 1
+            self.applied[entity_id] = time.monotonic()
+        else:
+            self.failed += 1
+
+    def prune(self):
+        """Forget applied overrides whose cooldown has passed."""
+        cutoff = time.monotonic() - self.cooldown_seconds
+        self.applied = {
+            entity_id: applied_at
+            for entity_id, applied_at in self.applied.items()
+            if applied_at >= cutoff
+        }
+
+    def __len__(self):
+        return len(self.in_flight)
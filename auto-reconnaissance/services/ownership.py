@@ -0,0 +1,164 @@
+import asyncio
+import os
+import socket
+import time
+from collections.abc import Callable, Iterable
+from logging import Logger
+
+from services.coordination import Coordinator
+from utils.hash_ring import HashRing, stable_hash
+
+DEFAULT_PARTITION_COUNT = 64
+DEFAULT_LEASE_SECONDS = 15
+# Leases are renewed this many times per lease period, so one slow renewal
+# doesn't lose them.
+RENEWALS_PER_LEASE = 3
+
+
+def default_instance_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class PartitionOwnership:
+    """Divides tracks between recon instances sharing a coordinator.
+
+    Tracks are split into a fixed number of partitions by a stable hash of
+    their entity_id, and the partitions are spread over the live instances
+    with a consistent hash ring. Each instance leases the partitions the ring
+    gives it and only arbitrates tracks in partitions it holds. When an
+    instance joins or leaves, the others see the new membership on their next
+    renewal and hand over or pick up partitions; a partition stays with its
+    previous holder until that holder lets go or its lease runs out, so no
+    track ever has two owners.
+
+    Owning a partition isn't enough to task its tracks: tracks in different
+    partitions can share an asset, and a partition can move to another
+    instance while a task on one of its tracks is still running. So the asset
+    and the track are both claimed through the coordinator before a task is
+    created, and the claims are held, and renewed with the leases, for as
+    long as the instance that created the task is tracking it.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        coordinator: Coordinator,
+        instance_id: str | None = None,
+        partitions: int = DEFAULT_PARTITION_COUNT,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ):
+        self.logger = logger
+        self.coordinator = coordinator
+        self.instance_id = instance_id or default_instance_id()
+        self.partitions = partitions
+        self.lease_seconds = lease_seconds
+        self.owned: set[int] = set()
+        # Wall-clock time the held leases lapse unless renewed first.
+        self.owned_until = 0.0
+        self.members: list[str] = []
+
+    def partition_of(self, entity_id: str) -> int:
+        return stable_hash(entity_id) % self.partitions
+
+    def owns(self, entity_id: str) -> bool:
+        return (
+            time.time() < self.owned_until
+            and self.partition_of(entity_id) in self.owned
+        )
+
+    def wanted_partitions(self, members: list[str]) -> set[int]:
+        ring = HashRing(members)
+        return {
+            partition
+            for partition in range(self.partitions)
+            if ring.owner(f"partition-{partition}") == self.instance_id
+        }
+
+    async def renew(self, held_entities: Iterable[str] = ()) -> set[str]:
+        """Refresh membership, partition leases and claims on the given entities.
+
+        A claim is lost when it lapsed, say through a long stall, and another
+        instance took it before this renewal.
+
+        Returns:
+            set: The ids among `held_entities` whose claims another instance now holds.
+        """
+        started = time.time()
+        members = await asyncio.to_thread(
+            self.coordinator.heartbeat, self.instance_id, self.lease_seconds
+        )
+        owned = await asyncio.to_thread(
+            self.coordinator.renew_leases,
+            self.instance_id,
+            self.wanted_partitions(members),
+            self.lease_seconds,
+        )
+        held_entities = list(held_entities)
+        lost = set()
+        if held_entities:
+            claimed = await asyncio.to_thread(
+                self.coordinator.claim_entities,
+                self.instance_id,
+                held_entities,
+                self.lease_seconds,
+            )
+            lost = set(held_entities) - claimed
+            if lost:
+                self.logger.warning(
+                    f"{self.instance_id} lost its claims on {sorted(lost)} to another instance"
+                )
+        if members != self.members or owned != self.owned:
+            self.logger.info(
+                f"{self.instance_id} holds {len(owned)}/{self.partitions} track partitions among {len(members)} instances"
+            )
+        self.members = members
+        self.owned = owned
+        self.owned_until = started + self.lease_seconds
+        return lost
+
+    async def maintain(
+        self,
+        held_entities: Callable[[], Iterable[str]],
+        on_lost: Callable[[set[str]], None],
+    ):
+        """Renew leases for as long as the instance runs.
+
+        Args:
+            held_entities: Returns the ids of the assets and tracks this instance
+                has tasks on, whose claims are renewed along with the partition leases.
+            on_lost: Called with the ids of held entities whose claims another
+                instance has taken, which this instance must stop acting on.
+        """
+        while True:
+            try:
+                lost = await self.renew(held_entities())
+                if lost:
+                    on_lost(lost)
+            except Exception:
+                # Leases lapse on their own if renewals keep failing; owns()
+                # stops answering True once they have.
+                self.logger.exception("failed to renew partition leases")
+            await asyncio.sleep(self.lease_seconds / RENEWALS_PER_LEASE)
+
+    async def claim(self, entity_ids: list[str]) -> bool:
+        """Claim every one of `entity_ids`, or none of them."""
+        claimed = await asyncio.to_thread(
+            self.coordinator.claim_entities,
+            self.instance_id,
+            entity_ids,
+            self.lease_seconds,
+        )
+        if claimed == set(entity_ids):
+            return True
+        if claimed:
+            await self.release(list(claimed))
+        return False
+
+    async def release(self, entity_ids: list[str]):
+        await asyncio.to_thread(
+            self.coordinator.release_entities, self.instance_id, entity_ids
+        )
+
+    def release_all(self):
+        self.owned = set()
+        self.coordinator.release_all(self.instance_id)
@@ -0,0 +1,113 @@
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from logging import Logger
+from pathlib import Path
+
+DEFAULT_PROFILE_CYCLES = 10
+DEFAULT_PROFILE_DIR = "profiles"
+# Modules whose allocations make up the cache; the tracemalloc diff is
+# filtered to these so CacheManager growth isn't lost among everything else.
+CACHE_MODULES = (
+    "cache_manager.py",
+    "lru_cache.py",
+    "expiring_cache.py",
+    "spatial_index.py",
+    "position_store.py",
+    "entity_record.py",
+)
+# Lines of each report to write.
+REPORT_LIMIT = 40
+
+
+class CycleProfiler:
+    """Captures a profile of the next few arbitration cycles on request.
+
+    `request` arms the profiler; each `cycle` after that runs under cProfile
+    until the requested number of cycles has been captured. tracemalloc
+    traces allocations from the request until the last cycle, and the growth
+    of the cache modules over that window is written out alongside the
+    profile. Both reports go to `output_dir`, named by the request time.
+    While idle, `cycle` is a single attribute check, so the hook can stay in
+    place in the field.
+
+    cProfile follows the thread, not the task: other coroutines that run
+    while a cycle awaits are included in its profile.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        output_dir: str = DEFAULT_PROFILE_DIR,
+        cycles: int = DEFAULT_PROFILE_CYCLES,
+    ):
+        self.logger = logger
+        self.output_dir = Path(output_dir)
+        self.cycles = cycles
+        self.remaining = 0
+        self.profile = None
+        self.snapshot = None
+        self.started_at = None
+        # Whether tracemalloc was started for this capture and should be stopped after.
+        self.owns_tracemalloc = False
+
+    def request(self, cycles: int | None = None):
+        if self.remaining:
+            self.logger.info(f"already profiling, {self.remaining} cycles left")
+            return
+        self.remaining = cycles or self.cycles
+        self.profile = cProfile.Profile()
+        self.owns_tracemalloc = not tracemalloc.is_tracing()
+        if self.owns_tracemalloc:
+            tracemalloc.start()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.started_at = datetime.now(UTC)
+        self.logger.info(f"profiling the next {self.remaining} arbitration cycles")
+
+    @contextmanager
+    def cycle(self):
+        if not self.remaining:
+            yield
+            return
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            self.remaining -= 1
+            if not self.remaining:
+                self._write_reports()
+
+    def _write_reports(self):
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%SZ")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        profile_path = self.output_dir / f"profile-{stamp}.prof"
+        self.profile.dump_stats(profile_path)
+        with open(self.output_dir / f"profile-{stamp}.txt", "w") as report:
+            pstats.Stats(self.profile, stream=report).sort_stats(
+                "cumulative"
+            ).print_stats(REPORT_LIMIT)
+
+        filters = [tracemalloc.Filter(True, f"*{module}") for module in CACHE_MODULES]
+        after = tracemalloc.take_snapshot()
+        growth = after.filter_traces(filters).compare_to(
+            self.snapshot.filter_traces(filters), "lineno"
+        )
+        traced, peak = tracemalloc.get_traced_memory()
+        if self.owns_tracemalloc:
+            tracemalloc.stop()
+        memory_path = self.output_dir / f"tracemalloc-{stamp}.txt"
+        with open(memory_path, "w") as report:
+            report.write(
+                f"cache growth {sum(stat.size_diff for stat in growth) / 1024:+.1f} KiB "
+                f"since {self.started_at.isoformat()}; traced {traced / 1024:.1f} KiB, "
+                f"peak {peak / 1024:.1f} KiB\n"
+            )
+            report.writelines(f"{stat}\n" for stat in growth[:REPORT_LIMIT])
+
+        self.profile = None
+        self.snapshot = None
+        self.logger.info(f"wrote {profile_path} and {memory_path}")
@@ -0,0 +1,166 @@
+from contextlib import contextmanager
+
+from utils.metrics import MetricsRegistry
+
+# Where the Prometheus scrape endpoint listens; a port of None disables it.
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+
+
+class ReconMetrics:
+    """The metrics the recon system records, all held in one registry.
+
+    Instruments updated on the hot path are plain counters and histograms.
+    State that already lives elsewhere (cache sizes, queue depth, stream
+    health) is registered with `watch_*` as callbacks read at scrape time.
+    """
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        self.cycle_seconds = self.registry.histogram(
+            "ears_arbitration_cycle_seconds",
+            "Duration of an arbitrate_isr pass.",
+            ("scan",),
+        )
+        self.candidate_pairs = self.registry.counter(
+            "ears_candidate_pairs_total",
+            "Asset/track pairs range-checked.",
+        )
+        self.in_range_pairs = self.registry.counter(
+            "ears_in_range_pairs_total",
+            "Asset/track pairs found within the distance threshold.",
+        )
+        self.predicted_pairs = self.registry.counter(
+            "ears_predicted_pairs_total",
+            "Asset/track pairs whose track is projected to enter range within the prediction horizon.",
+        )
+        self.lattice_call_seconds = self.registry.histogram(
+            "ears_lattice_call_seconds",
+            "Latency of Lattice API calls.",
+            ("endpoint",),
+        )
+        self.lattice_call_errors = self.registry.counter(
+            "ears_lattice_call_errors_total",
+            "Lattice API calls that raised.",
+            ("endpoint",),
+        )
+        self.entities_ingested = self.registry.counter(
+            "ears_entities_ingested_total",
+            "Entity updates applied to the cache; rate() gives entities per second.",
+        )
+        self.rescan_lateness_seconds = self.registry.histogram(
+            "ears_rescan_lateness_seconds",
+            "How late each full rescan started after its deadline; the cadence jitter.",
+        )
+        self.skipped_passes = self.registry.counter(
+            "ears_skipped_incremental_passes_total",
+            "Incremental passes skipped because they would overrun the next full rescan.",
+        )
+        self.tasks_created = self.registry.counter(
+            "ears_tasks_created_total",
+            "Orbit tasks created.",
+        )
+
+    @contextmanager
+    def lattice_call(self, endpoint: str):
+        """Time a Lattice call and count it as an error if it raises."""
+        with self.lattice_call_seconds.time(endpoint=endpoint):
+            try:
+                yield
+            except Exception:
+                self.lattice_call_errors.inc(endpoint=endpoint)
+                raise
+
+    def watch_cache(self, cache_manager):
+        stats = cache_manager.stats
+        for name, field, metric_type, documentation in (
+            ("ears_cache_entries", "size", "gauge", "Entries held in each cache."),
+            ("ears_cache_capacity", "capacity", "gauge", "Capacity of each cache."),
+            (
+                "ears_cache_evictions_total",
+                "evictions",
+                "counter",
+                "Entries evicted from each cache to make room.",
+            ),
+            (
+                "ears_cache_expirations_total",
+                "expirations",
+                "counter",
+                "Entries dropped from each cache after their expiry time.",
+            ),
+        ):
+            self.registry.callback(
+                name,
+                documentation,
+                lambda field=field: {
+                    (cache,): values[field] for cache, values in stats().items()
+                },
+                ("cache",),
+                metric_type,
+            )
+
+    def watch_ingest_queue(self, ingest_queue):
+        self.registry.callback(
+            "ears_ingest_queue_depth",
+            "Entity updates waiting to be applied to the cache.",
+            lambda: len(ingest_queue),
+        )
+        self.registry.callback(
+            "ears_ingest_queue_coalesced_total",
+            "Entity updates superseded by a newer update while still queued.",
+            lambda: ingest_queue.coalesced,
+            type="counter",
+        )
+        self.registry.callback(
+            "ears_ingest_queue_dropped_total",
+            "Entity updates dropped because the ingest queue was full.",
+            lambda: ingest_queue.dropped,
+            type="counter",
+        )
+
+    def watch_stream(self, entity_handler):
+        self.registry.callback(
+            "ears_stream_reconnects_total",
+            "Times the entity stream reconnected.",
+            lambda: entity_handler.reconnects,
+            type="counter",
+        )
+        self.registry.callback(
+            "ears_stream_downtime_seconds_total",
+            "Time spent with the entity stream disconnected.",
+            lambda: entity_handler.downtime_seconds,
+            type="counter",
+        )
+
+    def watch_schedule(self, schedule):
+        self.registry.callback(
+            "ears_missed_deadlines_total",
+            "Full rescan deadlines skipped because the previous cycle overran.",
+            lambda: schedule.missed,
+            type="counter",
+        )
+
+    def watch_overrides(self, overrides):
+        self.registry.callback(
+            "ears_overrides_total",
+            "Disposition overrides by outcome.",
+            lambda: {
+                ("sent",): overrides.sent,
+                ("coalesced",): overrides.coalesced,
+                ("failed",): overrides.failed,
+            },
+            ("outcome",),
+            "counter",
+        )
+
+    def watch_ownership(self, ownership):
+        self.registry.callback(
+            "ears_owned_partitions",
+            "Track partitions this instance holds leases on.",
+            lambda: len(ownership.owned),
+        )
+        self.registry.callback(
+            "ears_instances",
+            "Live recon instances sharing the coordination database.",
+            lambda: len(ownership.members),
+        )
@@ -0,0 +1,97 @@
+import asyncio
+import time
+from logging import Logger
+
+from services.task_store import TaskStore
+from services.tasker import Tasker
+
+# How long a fetched task status is trusted before it is fetched again.
+DEFAULT_TASK_STATUS_TTL_SECONDS = 1.0
+
+
+class TaskStatusCache:
+    """Caches whether tasks are executing so each task is fetched at most once per cycle.
+
+    The arbiter calls `refresh` once per arbitration pass with every task id it
+    is about to check; stale statuses are fetched concurrently, and lookups for
+    the rest of the pass are served from the cache. `hits` counts lookups
+    answered from the cache and `misses` counts status fetches sent to Lattice.
+    With a `store`, fetched statuses are persisted and forgotten tasks are
+    deleted from it.
+
+    A status that can't be fetched counts as still executing, so the pair is
+    skipped for this pass and checked again on a later one; it is not fetched
+    a second time within the pass.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        tasker: Tasker,
+        ttl_seconds: float = DEFAULT_TASK_STATUS_TTL_SECONDS,
+        store: TaskStore | None = None,
+    ):
+        self.logger = logger
+        self.tasker = tasker
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        # task_id -> (is_executing, monotonic time it was fetched)
+        self.statuses: dict[str, tuple[bool, float]] = {}
+        # Ids fetched by the latest refresh; trusted until the next one.
+        self.cycle_fetched: set[str] = set()
+        # Ids the latest refresh failed to fetch; not retried until the next one.
+        self.cycle_failed: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _is_fresh(self, task_id: str) -> bool:
+        if task_id in self.cycle_fetched:
+            return True
+        cached = self.statuses.get(task_id)
+        return cached is not None and time.monotonic() - cached[1] < self.ttl_seconds
+
+    async def _fetch(self, task_id: str) -> bool:
+        executing = await self.tasker.check_executing(task_id)
+        self.statuses[task_id] = (executing, time.monotonic())
+        if self.store:
+            self.store.record_status(task_id, executing)
+        return executing
+
+    async def refresh(self, task_ids):
+        """Concurrently fetch the status of every stale task in `task_ids`."""
+        stale = {task_id for task_id in task_ids if not self._is_fresh(task_id)}
+        self.cycle_fetched = set()
+        self.cycle_failed = set()
+        if not stale:
+            return
+        self.misses += len(stale)
+        results = await asyncio.gather(
+            *(self._fetch(task_id) for task_id in stale), return_exceptions=True
+        )
+        for task_id, result in zip(stale, results):
+            if isinstance(result, BaseException):
+                self.cycle_failed.add(task_id)
+            else:
+                self.cycle_fetched.add(task_id)
+
+    async def is_executing(self, task_id: str) -> bool:
+        if self._is_fresh(task_id):
+            self.hits += 1
+            return self.statuses[task_id][0]
+        if task_id in self.cycle_failed:
+            return True
+        self.misses += 1
+        try:
+            return await self._fetch(task_id)
+        except Exception:
+            self.logger.exception(
+                f"status of task {task_id} unavailable, treating it as executing"
+            )
+            return True
+
+    def forget(self, task_id: str):
+        self.statuses.pop(task_id, None)
+        self.cycle_fetched.discard(task_id)
+        self.cycle_failed.discard(task_id)
+        if self.store:
+            self.store.forget([task_id])
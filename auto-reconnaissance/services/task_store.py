@@ -0,0 +1,77 @@
+import sqlite3
+import time
+from typing import NamedTuple
+
+
+class StoredTask(NamedTuple):
+    task_id: str
+    asset_id: str
+    track_id: str
+    # Last status seen: True executing, False not, None never checked.
+    executing: bool | None
+    # Wall-clock time the task was created or its status last changed.
+    updated: float
+
+
+class TaskStore:
+    """Durable record of the Orbit tasks this instance has created.
+
+    Rows are written when a task is created, updated when its executing
+    status changes, and deleted once it has finished, so after a restart the
+    store holds exactly the investigations that may still be in flight.
+    WAL mode with synchronous=NORMAL keeps each write to an append to the
+    log, cheap enough to make from the event loop; a power loss can drop the
+    last few writes, but never corrupts the file.
+    """
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                asset_id TEXT NOT NULL,
+                track_id TEXT NOT NULL,
+                executing INTEGER,
+                updated REAL NOT NULL
+            )
+            """
+        )
+
+    def record_created(self, task_id: str, asset_id: str, track_id: str):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, NULL, ?)",
+            (task_id, asset_id, track_id, time.time()),
+        )
+
+    def record_status(self, task_id: str, executing: bool):
+        self.connection.execute(
+            "UPDATE tasks SET executing = ?, updated = ? "
+            "WHERE task_id = ? AND executing IS NOT ?",
+            (executing, time.time(), task_id, executing),
+        )
+
+    def forget(self, task_ids):
+        self.connection.executemany(
+            "DELETE FROM tasks WHERE task_id = ?", [(task_id,) for task_id in task_ids]
+        )
+
+    def load(self) -> list[StoredTask]:
+        return [
+            StoredTask(
+                task_id,
+                asset_id,
+                track_id,
+                None if executing is None else bool(executing),
+                updated,
+            )
+            for task_id, asset_id, track_id, executing, updated in self.connection.execute(
+                "SELECT task_id, asset_id, track_id, executing, updated FROM tasks "
+                "ORDER BY updated"
+            )
+        ]
+
+    def close(self):
+        self.connection.close()
@@ -1,17 +1,21 @@
+import asyncio
+import functools
 import json
+from contextlib import nullcontext
 from logging import Logger
 from pathlib import Path
 
 from anduril import (
-    Entity,
+    AsyncLattice,
     GoogleProtobufAny,
-    Lattice,
     Principal,
     Relations,
     System,
     TaskEntity,
 )
-from jsonschema import Draft202012Validator
+from services.recon_metrics import ReconMetrics
+from utils.endpoint import lattice_base_url
+from utils.entity_record import EntityRecord
 
 # Fully-qualified type URL of the Orbit task spec.
 ORBIT_SPECIFICATION_URL = (
@@ -30,7 +34,38 @@ _ORBIT_SCHEMA_PATH = (
     / "sample-app-auto-reconnaissance_protoschema-jsonschema"
     / "anduril.sample_app_auto_reconnaissance.v1.Orbit.jsonschema.bundle.json"
 )
-_ORBIT_VALIDATOR = Draft202012Validator(json.loads(_ORBIT_SCHEMA_PATH.read_text()))
+_OBJECTIVE_DEFINITION = (
+    "anduril.sample_app_auto_reconnaissance.v1.Objective.jsonschema.json"
+)
+
+
+@functools.cache
+def _orbit_validators() -> tuple:
+    """Load the Orbit schema and build its validators on first use.
+
+    jsonschema is slow to import and the bundle is parsed once per process,
+    so neither cost is paid until a Tasker is created.
+
+    Returns:
+        tuple: (validator for the whole Orbit payload, validator for its objective).
+    """
+    from jsonschema import Draft202012Validator
+
+    schema = json.loads(_ORBIT_SCHEMA_PATH.read_text())
+    orbit = Draft202012Validator(schema)
+    # The Orbit schema constrains each property independently, so the
+    # objective, the only field that differs between tasks, can be checked on
+    # its own against its definition while the constant orbit parameters are
+    # checked once.
+    objective = orbit.evolve(schema=schema["$defs"][_OBJECTIVE_DEFINITION])
+    return orbit, objective
+
+
+def _schema_errors(validator, payload, path=()) -> str | None:
+    errors = sorted(validator.iter_errors(payload), key=lambda e: list(e.path))
+    if not errors:
+        return None
+    return "; ".join(f"{[*path, *e.path]}: {e.message}" for e in errors)
 
 
 class Tasker:
@@ -42,43 +77,67 @@ class Tasker:
         client_secret: str,
         sandboxes_token: str | None = None,
         orbit_params: dict | None = None,
+        concurrency: asyncio.Semaphore | None = None,
+        metrics: ReconMetrics | None = None,
     ):
         self.logger = logger
         self.orbit_params = orbit_params or {}
-        self.client = Lattice(
-            base_url=f"https://{lattice_ip}",
+        self.orbit_template = (
+            self.orbit_parameters(self.orbit_params) if orbit_params else None
+        )
+        # Bounds how many Lattice calls are in flight at once; shared with the
+        # EntityHandler by the Arbiter. None leaves calls unbounded.
+        self.concurrency = concurrency or nullcontext()
+        self.metrics = metrics or ReconMetrics()
+        self.client = AsyncLattice(
+            base_url=lattice_base_url(lattice_ip),
             client_id=client_id,
             client_secret=client_secret,
             headers={"anduril-sandbox-authorization": f"Bearer {sandboxes_token}"},
         )
 
-    def build_orbit_specification(self, track: Entity) -> GoogleProtobufAny:
-        """Build and validate the Orbit task spec targeting `track`.
+    @staticmethod
+    def orbit_parameters(orbit_params: dict) -> dict:
+        """Validate the configured orbit parameters and return them as spec fields.
 
         Fields are camelCase to match the JSON Schema (and GoogleProtobufAny wire
-        format). We validate before sending so a bad orbit config is caught here
-        rather than on the asset that receives the task.
+        format). This runs once, when the Tasker is created, so a bad orbit
+        config fails at startup rather than on the asset that receives a task.
         """
-        specification = GoogleProtobufAny(
-            type=ORBIT_SPECIFICATION_URL,
-            objective={"entityId": track.entity_id},
-            orbitRadius=self.orbit_params["orbit_radius"],
-            orbitHeight=self.orbit_params["orbit_height"],
-            orbitDirection=self.orbit_params["orbit_direction"],
-        )
+        parameters = {
+            "orbitRadius": orbit_params["orbit_radius"],
+            "orbitHeight": orbit_params["orbit_height"],
+            "orbitDirection": orbit_params["orbit_direction"],
+        }
+        parameters = {
+            name: value for name, value in parameters.items() if value is not None
+        }
+        details = _schema_errors(_orbit_validators()[0], parameters)
+        if details:
+            raise ValueError(f"invalid Orbit task payload: {details}")
+        return parameters
 
-        payload = specification.model_dump(by_alias=True, exclude_none=True)
-        payload.pop("@type", None)
-        errors = sorted(
-            _ORBIT_VALIDATOR.iter_errors(payload), key=lambda e: list(e.path)
+    def build_orbit_specification(self, track: EntityRecord) -> GoogleProtobufAny:
+        """Build the Orbit task spec targeting `track`.
+
+        The orbit parameters were validated up front, so only the objective is
+        checked here.
+        """
+        objective = {"entityId": track.entity_id}
+        # A string entityId is all the objective schema asks of this shape; the
+        # validator only runs to describe a failure.
+        details = (
+            None
+            if isinstance(track.entity_id, str)
+            else _schema_errors(_orbit_validators()[1], objective, ("objective",))
         )
-        if errors:
-            details = "; ".join(f"{list(e.path)}: {e.message}" for e in errors)
+        if details:
             raise ValueError(f"invalid Orbit task payload: {details}")
+        return GoogleProtobufAny(
+            type=ORBIT_SPECIFICATION_URL, objective=objective, **self.orbit_template
+        )
 
-        return specification
-
-    def orbit(self, asset: Entity, track: Entity) -> str:
+    async def orbit(self, asset: EntityRecord, track: EntityRecord) -> str:
         try:
             self.logger.info(
                 f"Asset {asset.entity_id} tasked to Orbit Track {track.entity_id}"
@@ -91,17 +150,21 @@ class Tasker:
             relations_assignee_system = System(entity_id=asset.entity_id)
             relations_assignee = Principal(system=relations_assignee_system)
             relations = Relations(assignee=relations_assignee)
-            task_asset = TaskEntity(entity=asset, snapshot=False)
-            task_track = TaskEntity(entity=track, snapshot=False)
-
-            returned_task = self.client.tasks.create_task(
-                description=description,
-                specification=specification,
-                author=author,
-                relations=relations,
-                is_executed_elsewhere=False,
-                initial_entities=[task_asset, task_track],
-            )
+            # The cache holds slim records; rebuild the Entity payloads from them.
+            task_asset = TaskEntity(entity=asset.to_entity(), snapshot=False)
+            task_track = TaskEntity(entity=track.to_entity(), snapshot=False)
+
+            async with self.concurrency:
+                with self.metrics.lattice_call("create_task"):
+                    returned_task = await self.client.tasks.create_task(
+                        description=description,
+                        specification=specification,
+                        author=author,
+                        relations=relations,
+                        is_executed_elsewhere=False,
+                        initial_entities=[task_asset, task_track],
+                    )
+            self.metrics.tasks_created.inc()
 
             self.logger.info(
                 f"Task created - view Lattice UI, task id is {returned_task.version.task_id}"
@@ -111,9 +174,11 @@ class Tasker:
             self.logger.error(f"task creation error {e}")
             raise
 
-    def check_executing(self, task_id: str) -> bool:
+    async def check_executing(self, task_id: str) -> bool:
         try:
-            returned_task = self.client.tasks.get_task(task_id=task_id)
+            async with self.concurrency:
+                with self.metrics.lattice_call("get_task"):
+                    returned_task = await self.client.tasks.get_task(task_id=task_id)
             self.logger.info(
                 f"Current task status for this task_id is {returned_task.status.status}"
             )
@@ -0,0 +1,155 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Every program in the repo, by name. Each is started with --help, which
+# imports its whole module graph and exits once arguments are parsed.
+ENTRY_POINTS = {
+    "auto-reconnaissance": "auto-reconnaissance/main.py",
+    "benchmark": "auto-reconnaissance/benchmark.py",
+    "simulated-asset": "simulated_asset/asset.py",
+    "simulated-track": "simulated_track/track.py",
+    "fake-lattice": "fake_lattice/server.py",
+}
+# Startup time is noisier than steady-state work, so the default slack is wider.
+DEFAULT_TOLERANCE = 0.5
+METRICS = ("wall_ms", "import_ms")
+
+
+def parse_importtime(stderr: str) -> list[tuple[int, int, int, str]]:
+    """Parse `python -X importtime` output into (depth, self us, cumulative us, module)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, int(own), int(cumulative), name.strip()))
+    return rows
+
+
+def measure(script: str, runs: int) -> tuple[dict, list]:
+    """Start `script` `runs` times and return its median timings and module imports."""
+    walls, imports = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", script, "--help"],
+            cwd=REPO_ROOT,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=True,
+        )
+        walls.append(time.perf_counter() - start)
+        rows = parse_importtime(completed.stderr)
+        imports.append(
+            sum(cumulative for depth, _, cumulative, _ in rows if depth == 0)
+        )
+    return {
+        "wall_ms": round(statistics.median(walls) * 1000, 1),
+        "import_ms": round(statistics.median(imports) / 1000, 1),
+        "modules": len(rows),
+    }, rows
+
+
+def print_results(results: dict):
+    print(f"{'entry point':<24}{'wall ms':>10}{'import ms':>12}{'modules':>10}")
+    for name, metrics in results.items():
+        print(
+            f"{name:<24}{metrics['wall_ms']:>10.1f}{metrics['import_ms']:>12.1f}"
+            f"{metrics['modules']:>10}"
+        )
+
+
+def print_slowest(name: str, rows: list, top: int):
+    """Print the `top` modules by self time, in the importtime layout."""
+    print(f"\n{name}: slowest imports")
+    print(f"{'self us':>10} | {'cumulative':>10} | module")
+    for depth, own, cumulative, module in sorted(rows, key=lambda row: -row[1])[:top]:
+        print(f"{own:>10} | {cumulative:>10} | {'  ' * depth}{module}")
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for metric in METRICS:
+            limit = expected[metric] * (1 + tolerance)
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{name} {metric}: {metrics[metric]} > {expected[metric]} (+{tolerance:.0%})"
+                )
+    return regressions
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Cold-start time of each program, from python -X importtime"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Starts per entry point; the median is kept"
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=list(ENTRY_POINTS), help="Entry points to time"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=0,
+        help="Also list this many slowest imports of each entry point",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="Startup budget file to compare against; regressions exit 1",
+    )
+    parser.add_argument(
+        "--write-baseline", type=str, help="Write the results to this budget file"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Allowed fractional slowdown over the budget",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    results, imports = {}, {}
+    for name, script in ENTRY_POINTS.items():
+        if args.only and name not in args.only:
+            continue
+        results[name], imports[name] = measure(script, args.runs)
+    print_results(results)
+    for name, rows in imports.items():
+        if args.top:
+            print_slowest(name, rows, args.top)
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as ymlfile:
+            yaml.safe_dump(results, ymlfile, sort_keys=False)
+        print(f"wrote startup budget to {args.write_baseline}")
+    if args.baseline:
+        with open(args.baseline, "r") as ymlfile:
+            baseline = yaml.safe_load(ymlfile)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("startup regressions against budget:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("all entry points within startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import numpy as np
+from utils.distance_calculator import DistanceCalculator
+from utils.position_store import PositionStore
+
+ASSIGNMENT_MODES = ("greedy", "optimal")
+
+# Tracks with a higher priority are preferred by the optimal solver; each level
+# is worth `priority_weight_miles` of extra flight distance.
+DISPOSITION_PRIORITY = {
+    "DISPOSITION_HOSTILE": 2,
+    "DISPOSITION_SUSPICIOUS": 1,
+}
+
+# Cost given to pairs that are not eligible. It dwarfs any real distance, so the
+# solver only picks such a pair when it has nothing better, and those picks are
+# dropped afterwards.
+_INFEASIBLE_COST = 1e9
+
+
+class AssignmentSolver:
+    @staticmethod
+    def greedy(pairs: list[tuple]) -> list[tuple]:
+        """
+        Assign in the order given: the first eligible pair for an asset or track wins.
+
+        Args:
+            pairs (list[tuple]): Eligible (asset, track) pairs.
+
+        Returns:
+            list[tuple]: The (asset, track) pairs to task; each asset and track appears at most once.
+        """
+        assignments = []
+        claimed_assets = set()
+        claimed_tracks = set()
+        for asset, track in pairs:
+            if asset.entity_id in claimed_assets or track.entity_id in claimed_tracks:
+                continue
+            claimed_assets.add(asset.entity_id)
+            claimed_tracks.add(track.entity_id)
+            assignments.append((asset, track))
+        return assignments
+
+    @staticmethod
+    def optimal(
+        pairs: list[tuple],
+        priority_weight_miles: float = 0.0,
+        asset_positions: PositionStore | None = None,
+        track_positions: PositionStore | None = None,
+    ) -> list[tuple]:
+        """
+        Assign assets to tracks by solving a min-cost bipartite matching.
+
+        The cost of a pair is the asset-to-track distance in miles, less
+        `priority_weight_miles` per disposition priority level of the track. The
+        solver covers as many tracks as possible and, among those matchings,
+        minimizes the total cost.
+
+        Args:
+            pairs (list[tuple]): Eligible (asset, track) pairs.
+            priority_weight_miles (float): Distance one priority level is worth.
+            asset_positions (PositionStore): Optional store to read asset positions from instead of the entities.
+            track_positions (PositionStore): Optional store to read track positions from instead of the entities.
+
+        Returns:
+            list[tuple]: The (asset, track) pairs to task; each asset and track appears at most once.
+        """
+        if not pairs:
+            return []
+        assets = {}
+        tracks = {}
+        for asset, track in pairs:
+            assets.setdefault(asset.entity_id, asset)
+            tracks.setdefault(track.entity_id, track)
+        asset_rows = {entity_id: row for row, entity_id in enumerate(assets)}
+        track_columns = {entity_id: column for column, entity_id in enumerate(tracks)}
+        asset_list = list(assets.values())
+        track_list = list(tracks.values())
+
+        distances = DistanceCalculator.distance_matrix(
+            asset_positions.latlon(assets)
+            if asset_positions is not None
+            else DistanceCalculator.positions(asset_list),
+            track_positions.latlon(tracks)
+            if track_positions is not None
+            else DistanceCalculator.positions(track_list),
+        )
+        priorities = np.array(
+            [DISPOSITION_PRIORITY.get(track.disposition, 0) for track in track_list],
+            dtype=np.float64,
+        )
+        eligible = np.zeros(distances.shape, dtype=bool)
+        for asset, track in pairs:
+            eligible[asset_rows[asset.entity_id], track_columns[track.entity_id]] = True
+        cost = np.where(
+            eligible,
+            distances - priority_weight_miles * priorities[np.newaxis, :],
+            _INFEASIBLE_COST,
+        )
+
+        # scipy.optimize takes longer to import than everything else at
+        # startup combined, so only pay for it when optimal assignment runs.
+        from scipy.optimize import linear_sum_assignment
+
+        rows, columns = linear_sum_assignment(cost)
+        return [
+            (asset_list[row], track_list[column])
+            for row, column in zip(rows, columns)
+            if eligible[row, column]
+        ]
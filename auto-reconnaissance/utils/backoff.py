@@ -0,0 +1,23 @@
+import random
+
+
+class Backoff:
+    """Exponential backoff with full jitter.
+
+    Each delay is drawn uniformly from [0, min(max_seconds, initial_seconds *
+    2**attempt)], so many clients reconnecting after the same outage spread out
+    instead of retrying in lockstep.
+    """
+
+    def __init__(self, initial_seconds: float, max_seconds: float):
+        self.initial_seconds = initial_seconds
+        self.max_seconds = max_seconds
+        self.attempt = 0
+
+    def next_delay(self) -> float:
+        ceiling = min(self.max_seconds, self.initial_seconds * 2**self.attempt)
+        self.attempt += 1
+        return random.uniform(0, ceiling)
+
+    def reset(self):
+        self.attempt = 0
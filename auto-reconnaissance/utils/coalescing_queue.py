@@ -0,0 +1,43 @@
+import asyncio
+from collections import OrderedDict
+
+
+class CoalescingQueue:
+    """Bounded FIFO queue that keeps only the newest item per key.
+
+    Putting a key that is already queued replaces its item in place (latest
+    wins) without moving it, so a frequently updating key can't starve the
+    others. When the queue is full the oldest queued key is dropped to make
+    room. `coalesced` and `dropped` count both cases.
+    """
+
+    def __init__(self, max_depth: int):
+        self.items = OrderedDict()
+        self.max_depth = max_depth
+        self.not_empty = asyncio.Event()
+        self.coalesced = 0
+        self.dropped = 0
+
+    def put(self, key, item):
+        if key in self.items:
+            self.coalesced += 1
+        elif len(self.items) >= self.max_depth:
+            self.items.popitem(last=False)
+            self.dropped += 1
+        self.items[key] = item
+        self.not_empty.set()
+
+    async def get_batch(self) -> list:
+        """Wait until the queue is non-empty, then remove and return everything queued."""
+        await self.not_empty.wait()
+        batch = list(self.items.values())
+        self.items.clear()
+        self.not_empty.clear()
+        return batch
+
+    def clear(self):
+        self.items.clear()
+        self.not_empty.clear()
+
+    def __len__(self):
+        return len(self.items)
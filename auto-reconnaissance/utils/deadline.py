@@ -0,0 +1,32 @@
+class DeadlineSchedule:
+    """Deadlines on a fixed grid of `period` seconds from `start`.
+
+    The next deadline is set from the previous deadline, not from when the
+    work finished, so the cadence doesn't drift with the cost of each run.
+    A run that overshoots one or more deadlines skips them rather than
+    running back to back to catch up; skipped deadlines count as missed.
+    Times are whatever monotonic clock the caller passes in.
+    """
+
+    def __init__(self, period: float, start: float):
+        self.period = period
+        self.deadline = start
+        self.missed = 0
+
+    def due(self, now: float) -> bool:
+        return now >= self.deadline
+
+    def remaining(self, now: float) -> float:
+        return max(0.0, self.deadline - now)
+
+    def advance(self, now: float) -> tuple[float, int]:
+        """Move on to the first deadline after `now`.
+
+        Returns:
+            tuple: (how late `now` is for the current deadline, deadlines missed).
+        """
+        lateness = now - self.deadline
+        missed = int(lateness // self.period) if self.period > 0 else 0
+        self.deadline += (missed + 1) * self.period
+        self.missed += missed
+        return lateness, missed
@@ -1,5 +1,15 @@
+import numpy as np
 from anduril import Entity
-from geopy.distance import geodesic
+from utils.entity_record import EntityRecord
+
+# Mean Earth radius used by the vectorized haversine pass.
+EARTH_RADIUS_MILES = 3958.7613
+
+# The haversine formula treats the Earth as a sphere, which is off from the
+# WGS-84 ellipsoid used by geodesic by at most ~0.56%. Pairs whose haversine
+# distance falls within this fraction of the threshold are re-checked with an
+# exact geodesic solve so the batched mask agrees with `calculate`.
+HAVERSINE_TOLERANCE = 0.006
 
 
 class DistanceCalculator:
@@ -16,6 +26,10 @@ class DistanceCalculator:
         Returns:
             float: The distance between the two points in meters.
         """
+        # geopy takes ~100 ms to import and the arbitration path only needs it
+        # for borderline pairs, so it is imported on first use.
+        from geopy.distance import geodesic
+
         point1 = (
             asset.location.position.latitude_degrees,
             asset.location.position.longitude_degrees,
@@ -26,3 +40,135 @@ class DistanceCalculator:
         )
         distance = geodesic(point1, point2).miles
         return distance
+
+    @staticmethod
+    def positions(entities: list[EntityRecord]) -> np.ndarray:
+        """
+        Collect the latitude and longitude of each entity into an (N, 2) array of degrees.
+
+        Args:
+            entities (list[EntityRecord]): The cached entity records to read positions from.
+
+        Returns:
+            np.ndarray: One (latitude, longitude) row per entity, in the order given.
+        """
+        return np.array(
+            [(entity.latitude, entity.longitude) for entity in entities],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+
+    @staticmethod
+    def distance_matrix(
+        asset_positions: np.ndarray, track_positions: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the haversine distance in miles between every asset and every track in one pass.
+
+        Args:
+            asset_positions (np.ndarray): (A, 2) array of asset (latitude, longitude) degrees.
+            track_positions (np.ndarray): (T, 2) array of track (latitude, longitude) degrees.
+
+        Returns:
+            np.ndarray: (A, T) array of great-circle distances in miles.
+        """
+        asset_lat = np.radians(asset_positions[:, 0])[:, np.newaxis]
+        asset_lon = np.radians(asset_positions[:, 1])[:, np.newaxis]
+        track_lat = np.radians(track_positions[:, 0])[np.newaxis, :]
+        track_lon = np.radians(track_positions[:, 1])[np.newaxis, :]
+        a = (
+            np.sin((track_lat - asset_lat) / 2) ** 2
+            + np.cos(asset_lat)
+            * np.cos(track_lat)
+            * np.sin((track_lon - asset_lon) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    @staticmethod
+    def within_range_matrix(
+        asset_positions: np.ndarray,
+        track_positions: np.ndarray,
+        threshold_miles: float,
+    ) -> np.ndarray:
+        """
+        Determine which asset/track pairs are within `threshold_miles` of each other.
+
+        The bulk of the work is a single vectorized haversine pass. Pairs close enough
+        to the threshold that the spherical approximation could misclassify them are
+        re-checked with geodesic, so the mask matches `calculate` at the boundary.
+
+        Args:
+            asset_positions (np.ndarray): (A, 2) array of asset (latitude, longitude) degrees.
+            track_positions (np.ndarray): (T, 2) array of track (latitude, longitude) degrees.
+            threshold_miles (float): The maximum distance for a pair to count as in range.
+
+        Returns:
+            np.ndarray: (A, T) boolean mask, True where the pair is within range.
+        """
+        distances = DistanceCalculator.distance_matrix(asset_positions, track_positions)
+        in_range = distances <= threshold_miles
+        borderline = np.abs(distances - threshold_miles) <= (
+            threshold_miles * HAVERSINE_TOLERANCE
+        )
+        if borderline.any():
+            from geopy.distance import geodesic
+        for asset_index, track_index in zip(*np.nonzero(borderline)):
+            in_range[asset_index, track_index] = (
+                geodesic(
+                    tuple(asset_positions[asset_index]),
+                    tuple(track_positions[track_index]),
+                ).miles
+                <= threshold_miles
+            )
+        return in_range
+
+    @staticmethod
+    def enters_range(
+        asset_positions: np.ndarray,
+        track_positions: np.ndarray,
+        track_velocities: np.ndarray,
+        threshold_miles: float,
+        horizon_seconds: float,
+    ) -> np.ndarray:
+        """
+        Determine which tracks will come within `threshold_miles` of their asset within the horizon.
+
+        Each track is projected along a straight line at its current velocity, in a
+        flat east/north plane centred on the asset, and its closest approach over
+        the next `horizon_seconds` is compared to the threshold. The asset is taken
+        as stationary. The flat projection is accurate to well under a percent
+        over the tens of miles a look-ahead covers. A single asset or track row is
+        broadcast against the other side.
+
+        Args:
+            asset_positions (np.ndarray): (N, 2) array of asset (latitude, longitude) degrees.
+            track_positions (np.ndarray): (N, 2) array of track (latitude, longitude) degrees, paired row by row with the assets.
+            track_velocities (np.ndarray): (N, 2) array of track (east, north) velocities in miles per second.
+            threshold_miles (float): The maximum distance for a pair to count as in range.
+            horizon_seconds (float): How far ahead to project each track.
+
+        Returns:
+            np.ndarray: (N,) boolean array, True where the track reaches range within the horizon.
+        """
+        asset_lat = np.radians(asset_positions[:, 0])
+        north = (np.radians(track_positions[:, 0]) - asset_lat) * EARTH_RADIUS_MILES
+        east = (
+            np.radians(
+                (track_positions[:, 1] - asset_positions[:, 1] + 180) % 360 - 180
+            )
+            * np.cos(asset_lat)
+            * EARTH_RADIUS_MILES
+        )
+        velocity_east = track_velocities[:, 0]
+        velocity_north = track_velocities[:, 1]
+        speed_squared = velocity_east**2 + velocity_north**2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            closest = np.where(
+                speed_squared > 0,
+                -(east * velocity_east + north * velocity_north) / speed_squared,
+                0.0,
+            )
+        closest = np.clip(closest, 0.0, horizon_seconds)
+        return (
+            np.hypot(east + velocity_east * closest, north + velocity_north * closest)
+            <= threshold_miles
+        )
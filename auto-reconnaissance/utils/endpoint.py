@@ -0,0 +1,12 @@
+def lattice_base_url(endpoint: str) -> str:
+    """Build the SDK base URL for a `lattice-endpoint` config value.
+
+    Endpoints are normally bare hosts served over HTTPS. One that already
+    carries a scheme, such as `http://localhost:8080` for a local fake Lattice,
+    is used as given.
+
+    The programs share no modules, so auto-reconnaissance/utils/endpoint.py,
+    simulated_asset/asset.py and simulated_track/track.py each carry a copy
+    of this function; keep them in sync.
+    """
+    return endpoint if "://" in endpoint else f"https://{endpoint}"
@@ -0,0 +1,127 @@
+from anduril import Entity, Enu, Location, MilView, Ontology, Position, Provenance
+
+
+class EntityRecord:
+    """Compact projection of an `Entity` holding only what arbitration uses.
+
+    The full pydantic model carries aliases, health, task catalogs and more;
+    caching a record instead keeps per-entity memory small enough to hold tens
+    of thousands of tracks. `to_entity` rebuilds a minimal `Entity` for API
+    payloads that need one, such as the `TaskEntity` list on an Orbit task.
+    """
+
+    __slots__ = (
+        "altitude",
+        "data_type",
+        "disposition",
+        "entity_id",
+        "expiry_time",
+        "integration_name",
+        "latitude",
+        "longitude",
+        "source_description",
+        "source_id",
+        "source_update_time",
+        "template",
+        "velocity_east",
+        "velocity_north",
+    )
+
+    def __init__(
+        self,
+        entity_id: str,
+        template: str | None = None,
+        disposition: str | None = None,
+        latitude: float | None = None,
+        longitude: float | None = None,
+        altitude: float | None = None,
+        integration_name: str | None = None,
+        data_type: str | None = None,
+        source_id: str | None = None,
+        source_description: str | None = None,
+        source_update_time=None,
+        expiry_time: float | None = None,
+        velocity_east: float | None = None,
+        velocity_north: float | None = None,
+    ):
+        self.entity_id = entity_id
+        self.template = template
+        self.disposition = disposition
+        self.latitude = latitude
+        self.longitude = longitude
+        self.altitude = altitude
+        self.integration_name = integration_name
+        self.data_type = data_type
+        self.source_id = source_id
+        self.source_description = source_description
+        self.source_update_time = source_update_time
+        # Unix timestamp after which the entity is stale; None if it never expires.
+        self.expiry_time = expiry_time
+        # Reported velocity in m/s, when the source publishes one.
+        self.velocity_east = velocity_east
+        self.velocity_north = velocity_north
+
+    @classmethod
+    def from_entity(cls, entity: Entity) -> "EntityRecord":
+        position = entity.location.position if entity.location else None
+        velocity = entity.location.velocity_enu if entity.location else None
+        provenance = entity.provenance
+        return cls(
+            entity_id=entity.entity_id,
+            template=entity.ontology.template if entity.ontology else None,
+            disposition=entity.mil_view.disposition if entity.mil_view else None,
+            latitude=position.latitude_degrees if position else None,
+            longitude=position.longitude_degrees if position else None,
+            altitude=position.altitude_hae_meters if position else None,
+            integration_name=provenance.integration_name if provenance else None,
+            data_type=provenance.data_type if provenance else None,
+            source_id=provenance.source_id if provenance else None,
+            source_description=provenance.source_description if provenance else None,
+            source_update_time=provenance.source_update_time if provenance else None,
+            expiry_time=entity.expiry_time.timestamp()
+            if entity.expiry_time and not entity.no_expiry
+            else None,
+            velocity_east=velocity.e if velocity else None,
+            velocity_north=velocity.n if velocity else None,
+        )
+
+    @property
+    def has_position(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    @property
+    def has_velocity(self) -> bool:
+        return self.velocity_east is not None and self.velocity_north is not None
+
+    def to_entity(self) -> Entity:
+        """Rebuild a minimal `Entity` carrying the fields this record kept."""
+        return Entity(
+            entity_id=self.entity_id,
+            location=Location(
+                position=Position(
+                    latitude_degrees=self.latitude,
+                    longitude_degrees=self.longitude,
+                    altitude_hae_meters=self.altitude,
+                ),
+                velocity_enu=Enu(e=self.velocity_east, n=self.velocity_north)
+                if self.has_velocity
+                else None,
+            )
+            if self.has_position
+            else None,
+            mil_view=MilView(disposition=self.disposition),
+            ontology=Ontology(template=self.template),
+            provenance=Provenance(
+                integration_name=self.integration_name,
+                data_type=self.data_type,
+                source_id=self.source_id,
+                source_description=self.source_description,
+                source_update_time=self.source_update_time,
+            ),
+        )
+
+    def __repr__(self):
+        return (
+            f"EntityRecord({self.entity_id!r}, {self.template}, {self.disposition}, "
+            f"lat={self.latitude}, lon={self.longitude})"
+        )
@@ -0,0 +1,62 @@
+import heapq
+import time
+from collections.abc import Callable
+
+from utils.lru_cache import LRUCache
+
+
+class ExpiringCache(LRUCache):
+    """LRU cache whose entries can also carry an absolute expiry time.
+
+    Expiry times are kept in a min-heap, so `sweep` only looks at entries that
+    are actually due. Heap entries are invalidated lazily: a re-put with a new
+    expiry pushes a fresh entry and the stale one is skipped when popped.
+    `on_evict` is called for both capacity evictions and expirations; the
+    `evictions` and `expirations` counters tell them apart.
+    """
+
+    def __init__(self, capacity: int, on_evict: Callable | None = None):
+        super().__init__(capacity, on_evict=self._evicted)
+        self.on_removed = on_evict
+        self.expiry: dict = {}
+        self.heap: list[tuple[float, str]] = []
+        self.expirations = 0
+
+    def _evicted(self, key, value):
+        self.expiry.pop(key, None)
+        if self.on_removed:
+            self.on_removed(key, value)
+
+    def put(self, key, value, expires_at: float | None = None):
+        """Insert or refresh `key`; `expires_at` is a Unix timestamp, None never expires."""
+        super().put(key, value)
+        if expires_at is None:
+            self.expiry.pop(key, None)
+            return
+        if self.expiry.get(key) != expires_at:
+            self.expiry[key] = expires_at
+            heapq.heappush(self.heap, (expires_at, key))
+            # Drop superseded heap entries once they outnumber the live ones.
+            if len(self.heap) > 2 * len(self.expiry) + 64:
+                self.heap = [(when, k) for k, when in self.expiry.items()]
+                heapq.heapify(self.heap)
+
+    def remove(self, key):
+        super().remove(key)
+        self.expiry.pop(key, None)
+
+    def sweep(self, now: float | None = None) -> int:
+        """Remove every entry whose expiry time has passed; returns how many were removed."""
+        now = time.time() if now is None else now
+        removed = 0
+        while self.heap and self.heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self.heap)
+            if self.expiry.get(key) != expires_at:
+                continue
+            del self.expiry[key]
+            value = self.cache.pop(key)
+            self.expirations += 1
+            removed += 1
+            if self.on_removed:
+                self.on_removed(key, value)
+        return removed
@@ -0,0 +1,38 @@
+import bisect
+import hashlib
+
+# Points each member gets on the ring; more points spread partitions more evenly.
+DEFAULT_REPLICAS = 64
+
+
+def stable_hash(key: str) -> int:
+    """A 64-bit hash of `key` that is the same in every process and run.
+
+    The built-in `hash` is salted per process, so instances would disagree.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring mapping keys onto a set of members.
+
+    Each member is placed at `replicas` points on the ring, and a key belongs
+    to the first member point at or after the key's own hash. Adding or
+    removing a member only moves the keys next to its points, so a
+    membership change reshuffles about 1/N of the keys rather than all of them.
+    """
+
+    def __init__(self, members, replicas: int = DEFAULT_REPLICAS):
+        points = sorted(
+            (stable_hash(f"{member}#{replica}"), member)
+            for member in members
+            for replica in range(replicas)
+        )
+        self.hashes = [point for point, _ in points]
+        self.members = [member for _, member in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self.hashes:
+            return None
+        index = bisect.bisect_left(self.hashes, stable_hash(key))
+        return self.members[index % len(self.members)]
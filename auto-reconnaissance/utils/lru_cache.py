@@ -1,10 +1,14 @@
 from collections import OrderedDict
+from collections.abc import Callable
 
 
 class LRUCache:
-    def __init__(self, capacity: int):
+    def __init__(self, capacity: int, on_evict: Callable | None = None):
         self.cache = OrderedDict()
         self.capacity = capacity
+        # Called with (key, value) whenever put() evicts the least recently used entry.
+        self.on_evict = on_evict
+        self.evictions = 0
 
     def get(self, key):
         if key not in self.cache:
@@ -19,9 +23,15 @@ class LRUCache:
         if key in self.cache:
             self.cache.move_to_end(key)
         elif len(self.cache) >= self.capacity:
-            self.cache.popitem(last=False)
+            evicted_key, evicted_value = self.cache.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(evicted_key, evicted_value)
         self.cache[key] = value
 
     def remove(self, key):
         if key in self.cache:
             del self.cache[key]
+
+    def __len__(self):
+        return len(self.cache)
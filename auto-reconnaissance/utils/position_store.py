@@ -0,0 +1,78 @@
+import numpy as np
+
+INITIAL_CAPACITY = 256
+
+
+class PositionStore:
+    """Struct-of-arrays store of entity positions.
+
+    Latitude, longitude and altitude live in contiguous float64 arrays, one slot
+    per entity, with an id <-> slot map. Live slots are kept packed at the front
+    of the arrays (removal moves the last slot into the hole), so `[:len(store)]`
+    is always a dense view. Readers get positions without touching the pydantic
+    models or allocating per-entity tuples.
+    """
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.latitudes = np.empty(capacity, dtype=np.float64)
+        self.longitudes = np.empty(capacity, dtype=np.float64)
+        self.altitudes = np.empty(capacity, dtype=np.float64)
+        self.slots: dict[str, int] = {}
+        self.ids: list[str] = []
+
+    def _grow(self):
+        capacity = 2 * len(self.latitudes)
+        for name in ("latitudes", "longitudes", "altitudes"):
+            grown = np.empty(capacity, dtype=np.float64)
+            grown[: len(self.ids)] = getattr(self, name)[: len(self.ids)]
+            setattr(self, name, grown)
+
+    def update(
+        self, entity_id: str, latitude: float, longitude: float, altitude: float
+    ):
+        slot = self.slots.get(entity_id)
+        if slot is None:
+            slot = len(self.ids)
+            if slot == len(self.latitudes):
+                self._grow()
+            self.slots[entity_id] = slot
+            self.ids.append(entity_id)
+        self.latitudes[slot] = latitude
+        self.longitudes[slot] = longitude
+        self.altitudes[slot] = altitude
+
+    def remove(self, entity_id: str):
+        slot = self.slots.pop(entity_id, None)
+        if slot is None:
+            return
+        last = len(self.ids) - 1
+        last_id = self.ids.pop()
+        if slot != last:
+            self.latitudes[slot] = self.latitudes[last]
+            self.longitudes[slot] = self.longitudes[last]
+            self.altitudes[slot] = self.altitudes[last]
+            self.ids[slot] = last_id
+            self.slots[last_id] = slot
+
+    def slots_for(self, entity_ids) -> np.ndarray:
+        return np.fromiter(
+            (self.slots[entity_id] for entity_id in entity_ids), dtype=np.intp
+        )
+
+    def latlon(self, entity_ids=None) -> np.ndarray:
+        """Return an (N, 2) array of (latitude, longitude) degrees.
+
+        Args:
+            entity_ids: The ids to look up, in order. Defaults to every stored entity in slot order.
+        """
+        if entity_ids is None:
+            size = len(self.ids)
+            return np.column_stack((self.latitudes[:size], self.longitudes[:size]))
+        slots = self.slots_for(entity_ids)
+        return np.column_stack((self.latitudes[slots], self.longitudes[slots]))
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.slots
+
+    def __len__(self):
+        return len(self.ids)
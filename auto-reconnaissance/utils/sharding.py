@@ -0,0 +1,185 @@
+import asyncio
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from utils.distance_calculator import DistanceCalculator
+from utils.spatial_index import MILES_PER_DEGREE
+
+DEFAULT_SHARD_TILE_MILES = 25
+# Work units submitted per worker each pass; more than one lets a worker that
+# drew sparse tiles pick up another unit instead of idling.
+BATCHES_PER_WORKER = 2
+# Largest asset x track distance matrix a worker builds at once; bigger tiles
+# are range-checked a slice of assets at a time to bound worker memory.
+MAX_MATRIX_ELEMENTS = 1_000_000
+
+
+def partition(
+    asset_latlon: np.ndarray,
+    track_latlon: np.ndarray,
+    tile_miles: float,
+    margin_miles: float,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Split assets into geographic tiles, each with the tracks that could be in range.
+
+    Every asset belongs to exactly one tile, chosen by its position. A tile
+    takes every track within `margin_miles` of its bounds, so tracks near a
+    border appear in several tiles, but each asset/track pair is evaluated
+    once, in the asset's tile.
+
+    Args:
+        asset_latlon (np.ndarray): (A, 2) array of asset (latitude, longitude) degrees.
+        track_latlon (np.ndarray): (T, 2) array of track (latitude, longitude) degrees.
+        tile_miles (float): Height and (at the equator) width of a tile.
+        margin_miles (float): How far past its bounds a tile collects tracks; the range threshold.
+
+    Returns:
+        list: (asset rows, track rows) index arrays into the inputs, one per tile
+        holding at least one asset and one track.
+    """
+    if not len(asset_latlon) or not len(track_latlon):
+        return []
+    tile_degrees = tile_miles / MILES_PER_DEGREE
+    lat_margin = margin_miles / MILES_PER_DEGREE
+    rows = np.floor((asset_latlon[:, 0] + 90) / tile_degrees).astype(np.int64)
+    columns = np.floor((asset_latlon[:, 1] + 180) / tile_degrees).astype(np.int64)
+    keys, inverse = np.unique(
+        np.column_stack((rows, columns)), axis=0, return_inverse=True
+    )
+    inverse = inverse.reshape(-1)
+    asset_order = np.argsort(inverse, kind="stable")
+    asset_bounds = np.searchsorted(inverse[asset_order], np.arange(len(keys) + 1))
+    # Tracks sorted by latitude, so each tile only filters its latitude band.
+    track_order = np.argsort(track_latlon[:, 0], kind="stable")
+    sorted_latitudes = track_latlon[track_order, 0]
+
+    tiles = []
+    for tile, (row, column) in enumerate(keys):
+        south = row * tile_degrees - 90 - lat_margin
+        north = (row + 1) * tile_degrees - 90 + lat_margin
+        start = np.searchsorted(sorted_latitudes, south, side="left")
+        stop = np.searchsorted(sorted_latitudes, north, side="right")
+        band = track_order[start:stop]
+        if not len(band):
+            continue
+        # As in SpatialGrid.query, size the longitude margin for the most
+        # poleward latitude the tile reaches.
+        cos_edge = math.cos(math.radians(min(max(abs(south), abs(north)), 90.0)))
+        if cos_edge <= lat_margin / 180:
+            half_width = 180.0
+        else:
+            half_width = tile_degrees / 2 + lat_margin / cos_edge
+        centre = (column + 0.5) * tile_degrees - 180
+        offsets = np.abs((track_latlon[band, 1] - centre + 180) % 360 - 180)
+        nearby = band[offsets <= half_width]
+        if len(nearby):
+            tiles.append(
+                (asset_order[asset_bounds[tile] : asset_bounds[tile + 1]], nearby)
+            )
+    return tiles
+
+
+def balance(tiles: list[tuple[np.ndarray, np.ndarray]], batches: int) -> list[list]:
+    """Group tile numbers into at most `batches` lists of roughly equal pair counts."""
+    loads = [0] * batches
+    groups = [[] for _ in range(batches)]
+    for tile in sorted(
+        range(len(tiles)), key=lambda tile: -len(tiles[tile][0]) * len(tiles[tile][1])
+    ):
+        lightest = loads.index(min(loads))
+        groups[lightest].append(tile)
+        loads[lightest] += len(tiles[tile][0]) * len(tiles[tile][1])
+    return [group for group in groups if group]
+
+
+def evaluate_tiles(
+    tiles: list[tuple[np.ndarray, np.ndarray]], threshold_miles: float
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Range-check each tile's (asset positions, track positions); runs in a worker.
+
+    Returns:
+        list: Per tile, the (asset row, track row) indices of its in-range pairs.
+    """
+    results = []
+    for assets, tracks in tiles:
+        step = max(1, MAX_MATRIX_ELEMENTS // len(tracks))
+        asset_rows, track_rows = [], []
+        for first in range(0, len(assets), step):
+            in_range = DistanceCalculator.within_range_matrix(
+                assets[first : first + step], tracks, threshold_miles
+            )
+            rows, track_columns = np.nonzero(in_range)
+            asset_rows.append(rows + first)
+            track_rows.append(track_columns)
+        results.append(
+            (
+                np.concatenate(asset_rows).astype(np.int32),
+                np.concatenate(track_rows).astype(np.int32),
+            )
+        )
+    return results
+
+
+class ShardPool:
+    """Range-checks every asset against every track across a process pool.
+
+    Positions are partitioned into tiles and the tiles are spread over the
+    workers. Workers only ever receive the compact position arrays for their
+    tiles and send back index arrays, never entity objects.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        threshold_miles: float,
+        tile_miles: float = DEFAULT_SHARD_TILE_MILES,
+    ):
+        self.workers = workers
+        self.threshold_miles = threshold_miles
+        self.tile_miles = tile_miles
+        # Spawned rather than forked, so workers don't inherit the event loop
+        # or open connections.
+        self.executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def in_range(
+        self, asset_latlon: np.ndarray, track_latlon: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, int]:
+        """Return the in-range pairs of the given positions.
+
+        Returns:
+            tuple: (asset rows, track rows) of the in-range pairs, and the
+            number of candidate pairs the workers range-checked.
+        """
+        tiles = partition(
+            asset_latlon, track_latlon, self.tile_miles, self.threshold_miles
+        )
+        groups = balance(tiles, self.workers * BATCHES_PER_WORKER)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor,
+                    evaluate_tiles,
+                    [
+                        (asset_latlon[tiles[tile][0]], track_latlon[tiles[tile][1]])
+                        for tile in group
+                    ],
+                    self.threshold_miles,
+                )
+                for group in groups
+            )
+        )
+        asset_rows, track_rows = [np.empty(0, np.intp)], [np.empty(0, np.intp)]
+        for group, result in zip(groups, results):
+            for tile, (tile_assets, tile_tracks) in zip(group, result):
+                asset_rows.append(tiles[tile][0][tile_assets])
+                track_rows.append(tiles[tile][1][tile_tracks])
+        candidates = sum(len(assets) * len(tracks) for assets, tracks in tiles)
+        return np.concatenate(asset_rows), np.concatenate(track_rows), candidates
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,79 @@
+import math
+
+# Miles spanned by one degree of latitude at the equator, the shortest it gets on
+# the WGS-84 ellipsoid. Using the minimum means spans computed from it err wide.
+MILES_PER_DEGREE = 68.7
+
+
+class SpatialGrid:
+    """Uniform latitude/longitude grid bucketing entity ids by position.
+
+    Cells are `cell_size_miles` tall, and as many degrees of longitude wide,
+    narrowed just enough that a whole number of columns spans the globe so
+    columns wrap cleanly at the antimeridian. A radius query only visits the
+    cells the radius can reach, so its cost grows with the local density of
+    entities rather than with the total number indexed. Results are candidates: callers
+    still apply an exact distance check.
+    """
+
+    def __init__(self, cell_size_miles: float):
+        self.cell_size_degrees = cell_size_miles / MILES_PER_DEGREE
+        self.lon_cells = math.ceil(360 / self.cell_size_degrees)
+        self.lon_cell_degrees = 360 / self.lon_cells
+        self.cells: dict[tuple[int, int], dict[str, None]] = {}
+        self.entity_cells: dict[str, tuple[int, int]] = {}
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        row = math.floor((latitude + 90) / self.cell_size_degrees)
+        column = math.floor((longitude + 180) / self.lon_cell_degrees)
+        return row, column % self.lon_cells
+
+    def update(self, entity_id: str, latitude: float, longitude: float):
+        cell = self._cell(latitude, longitude)
+        previous = self.entity_cells.get(entity_id)
+        if previous == cell:
+            return
+        if previous is not None:
+            self._discard(entity_id, previous)
+        self.cells.setdefault(cell, {})[entity_id] = None
+        self.entity_cells[entity_id] = cell
+
+    def remove(self, entity_id: str):
+        previous = self.entity_cells.pop(entity_id, None)
+        if previous is not None:
+            self._discard(entity_id, previous)
+
+    def _discard(self, entity_id: str, cell: tuple[int, int]):
+        members = self.cells[cell]
+        del members[entity_id]
+        if not members:
+            del self.cells[cell]
+
+    def query(self, latitude: float, longitude: float, radius_miles: float) -> list:
+        """Return the ids of every entity in a cell the radius could reach."""
+        lat_span = radius_miles / MILES_PER_DEGREE
+        # A degree of longitude shrinks with cos(latitude); size the longitude
+        # span for the most poleward latitude the radius reaches.
+        edge_latitude = min(abs(latitude) + lat_span, 90.0)
+        cos_edge = math.cos(math.radians(edge_latitude))
+        if cos_edge <= lat_span / 180:
+            lon_span = 180.0
+        else:
+            lon_span = min(lat_span / cos_edge, 180.0)
+
+        min_row, min_column = self._cell(latitude - lat_span, longitude - lon_span)
+        max_row, _ = self._cell(latitude + lat_span, longitude + lon_span)
+        column_count = min(
+            math.ceil(2 * lon_span / self.lon_cell_degrees) + 1, self.lon_cells
+        )
+
+        candidates = []
+        for row in range(min_row, max_row + 1):
+            for offset in range(column_count):
+                members = self.cells.get((row, (min_column + offset) % self.lon_cells))
+                if members:
+                    candidates.extend(members)
+        return candidates
+
+    def __len__(self):
+        return len(self.entity_cells)
@@ -0,0 +1,141 @@
+import math
+import random
+from datetime import UTC, datetime
+
+from anduril import Entity, Enu, Location, MilView, Ontology, Position, Provenance
+from utils.spatial_index import MILES_PER_DEGREE
+
+TRACK_DISPOSITIONS = (
+    "DISPOSITION_UNKNOWN",
+    "DISPOSITION_SUSPICIOUS",
+    "DISPOSITION_HOSTILE",
+    "DISPOSITION_FRIENDLY",
+)
+
+
+def random_position(
+    rng: random.Random, center: tuple[float, float], radius_miles: float
+) -> tuple[float, float]:
+    """
+    Pick a point uniformly at random within `radius_miles` of `center`.
+
+    Args:
+        rng (random.Random): Source of randomness, so populations are reproducible.
+        center (tuple): (latitude, longitude) degrees of the disc centre.
+        radius_miles (float): Radius of the disc.
+
+    Returns:
+        tuple: (latitude, longitude) degrees.
+    """
+    distance = radius_miles * math.sqrt(rng.random())
+    bearing = rng.uniform(0, 2 * math.pi)
+    latitude = center[0] + distance * math.cos(bearing) / MILES_PER_DEGREE
+    longitude = center[1] + distance * math.sin(bearing) / (
+        MILES_PER_DEGREE * max(math.cos(math.radians(latitude)), 1e-6)
+    )
+    return latitude, longitude
+
+
+def synthetic_entity(
+    entity_id: str,
+    template: str,
+    disposition: str,
+    latitude: float,
+    longitude: float,
+) -> Entity:
+    return Entity(
+        entity_id=entity_id,
+        is_live=True,
+        ontology=Ontology(template=template),
+        mil_view=MilView(disposition=disposition),
+        location=Location(
+            position=Position(
+                latitude_degrees=latitude,
+                longitude_degrees=longitude,
+                altitude_hae_meters=1000,
+            )
+        ),
+        provenance=Provenance(
+            integration_name="synthetic",
+            data_type="synthetic",
+            source_update_time=datetime.now(UTC),
+        ),
+    )
+
+
+def generate_assets(
+    count: int, center: tuple[float, float], radius_miles: float, seed: int = 0
+) -> list[Entity]:
+    """Generate `count` friendly assets spread uniformly over a disc."""
+    rng = random.Random(seed)
+    return [
+        synthetic_entity(
+            f"synthetic-asset-{index}",
+            "TEMPLATE_ASSET",
+            "DISPOSITION_FRIENDLY",
+            *random_position(rng, center, radius_miles),
+        )
+        for index in range(count)
+    ]
+
+
+def generate_tracks(
+    count: int, center: tuple[float, float], radius_miles: float, seed: int = 0
+) -> list[Entity]:
+    """Generate `count` tracks with mixed dispositions spread uniformly over a disc."""
+    rng = random.Random(seed + 1)
+    return [
+        synthetic_entity(
+            f"synthetic-track-{index}",
+            "TEMPLATE_TRACK",
+            rng.choice(TRACK_DISPOSITIONS),
+            *random_position(rng, center, radius_miles),
+        )
+        for index in range(count)
+    ]
+
+
+def jitter(entities: list[Entity], rng: random.Random, miles: float) -> list[Entity]:
+    """Return copies of `entities` each moved up to `miles` from where it was."""
+    moved = []
+    for entity in entities:
+        position = entity.location.position
+        latitude, longitude = random_position(
+            rng, (position.latitude_degrees, position.longitude_degrees), miles
+        )
+        moved.append(
+            synthetic_entity(
+                entity.entity_id,
+                entity.ontology.template,
+                entity.mil_view.disposition,
+                latitude,
+                longitude,
+            )
+        )
+    return moved
+
+
+def moving(
+    entities: list[Entity], rng: random.Random, max_speed_mps: float
+) -> list[Entity]:
+    """Return copies of `entities` each reporting a random velocity up to `max_speed_mps`."""
+    moved = []
+    for entity in entities:
+        speed = max_speed_mps * rng.random()
+        heading = rng.uniform(0, 2 * math.pi)
+        moved.append(
+            entity.model_copy(
+                update={
+                    "location": entity.location.model_copy(
+                        update={
+                            "velocity_enu": Enu(
+                                e=speed * math.sin(heading),
+                                n=speed * math.cos(heading),
+                                u=0.0,
+                            )
+                        }
+                    )
+                }
+            )
+        )
+    return moved
@@ -0,0 +1,122 @@
+import numpy as np
+from utils.distance_calculator import EARTH_RADIUS_MILES
+
+INITIAL_CAPACITY = 256
+# Position samples kept per track; velocity is estimated across the window.
+DEFAULT_TRACK_HISTORY_DEPTH = 8
+# Columns of a sample.
+TIME, LATITUDE, LONGITUDE = range(3)
+
+
+class TrackHistory:
+    """Fixed-depth ring buffer of recent (time, latitude, longitude) per track.
+
+    Samples live in one (slots, depth, 3) float64 array, a row per track,
+    with a per-row head index pointing at the newest sample. Recording a
+    sample overwrites the oldest one in place, so a track's history never
+    grows or allocates once its row exists. Rows are kept packed like
+    `PositionStore`: removal moves the last row into the hole. Heads, counts
+    and newest times are plain lists, since numpy scalar access would
+    dominate the cost of recording one sample.
+    """
+
+    def __init__(
+        self,
+        depth: int = DEFAULT_TRACK_HISTORY_DEPTH,
+        capacity: int = INITIAL_CAPACITY,
+    ):
+        self.depth = depth
+        self.samples = np.empty((capacity, depth, 3), dtype=np.float64)
+        self.heads: list[int] = []
+        self.counts: list[int] = []
+        self.newest: list[float] = []
+        self.slots: dict[str, int] = {}
+        self.ids: list[str] = []
+
+    def _grow(self):
+        grown = np.empty((2 * len(self.samples), self.depth, 3), dtype=np.float64)
+        grown[: len(self.ids)] = self.samples[: len(self.ids)]
+        self.samples = grown
+
+    def record(
+        self, entity_id: str, timestamp: float, latitude: float, longitude: float
+    ):
+        """Append a sample, unless it is older than the newest one already held.
+
+        A sample with the same timestamp as the newest replaces it, so the same
+        update delivered twice doesn't take up two slots.
+        """
+        slot = self.slots.get(entity_id)
+        if slot is None:
+            slot = len(self.ids)
+            if slot == len(self.samples):
+                self._grow()
+            self.slots[entity_id] = slot
+            self.ids.append(entity_id)
+            self.heads.append(0)
+            self.counts.append(1)
+            self.newest.append(timestamp)
+        elif timestamp > self.newest[slot]:
+            self.heads[slot] = (self.heads[slot] + 1) % self.depth
+            self.counts[slot] = min(self.counts[slot] + 1, self.depth)
+            self.newest[slot] = timestamp
+        elif timestamp < self.newest[slot]:
+            return
+        self.samples[slot, self.heads[slot]] = (timestamp, latitude, longitude)
+
+    def remove(self, entity_id: str):
+        slot = self.slots.pop(entity_id, None)
+        if slot is None:
+            return
+        last = len(self.ids) - 1
+        last_id = self.ids.pop()
+        head, count, newest = self.heads.pop(), self.counts.pop(), self.newest.pop()
+        if slot != last:
+            self.samples[slot] = self.samples[last]
+            self.heads[slot], self.counts[slot], self.newest[slot] = head, count, newest
+            self.ids[slot] = last_id
+            self.slots[last_id] = slot
+
+    def velocities(self, entity_ids) -> np.ndarray:
+        """Estimate (east, north) velocity in miles per second for each id, in order.
+
+        The estimate is the displacement between the oldest and newest sample
+        held, over the time between them, which smooths out jitter in single
+        updates. Rows are NaN for ids with fewer than two samples.
+        """
+        velocities = np.full((len(entity_ids), 2), np.nan)
+        rows = np.fromiter(
+            (self.slots.get(entity_id, -1) for entity_id in entity_ids),
+            dtype=np.intp,
+            count=len(entity_ids),
+        )
+        known = np.flatnonzero(rows >= 0)
+        slots = rows[known]
+        counts = np.asarray(self.counts, dtype=np.intp)[slots]
+        heads = np.asarray(self.heads, dtype=np.intp)[slots]
+        newest = self.samples[slots, heads]
+        oldest = self.samples[slots, (heads - counts + 1) % self.depth]
+        elapsed = newest[:, TIME] - oldest[:, TIME]
+        moving = (counts > 1) & (elapsed > 0)
+        known, newest, oldest, elapsed = (
+            known[moving],
+            newest[moving],
+            oldest[moving],
+            elapsed[moving],
+        )
+        latitude = np.radians(newest[:, LATITUDE])
+        north = latitude - np.radians(oldest[:, LATITUDE])
+        # Wrap the longitude change so a track crossing the antimeridian
+        # doesn't appear to circle the globe.
+        east = np.radians(
+            (newest[:, LONGITUDE] - oldest[:, LONGITUDE] + 180) % 360 - 180
+        )
+        velocities[known, 0] = east * np.cos(latitude) * EARTH_RADIUS_MILES / elapsed
+        velocities[known, 1] = north * EARTH_RADIUS_MILES / elapsed
+        return velocities
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self.slots
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,573 @@
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import re
+import typing
+import uuid
+from datetime import UTC, datetime
+from urllib.parse import unquote, urlsplit
+
+import yaml
+from anduril.types.mil_view_disposition import MilViewDisposition
+from anduril.types.ontology_template import OntologyTemplate
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_SEED_RADIUS_MILES = 10
+MILES_PER_DEGREE = 68.7
+# How long listen_as_agent holds a request open before returning an empty
+# AgentRequest so the agent polls again.
+LISTEN_TIMEOUT_SECONDS = 30
+# How often expired entities are removed and surfaced as deletions.
+EXPIRY_SWEEP_SECONDS = 1
+# Fields every streamed entity keeps regardless of components_to_include.
+STREAM_BASE_FIELDS = ("entityId", "isLive", "expiryTime", "createdTime", "noExpiry")
+
+
+def enum_numbers(sdk_enum) -> dict[str, int]:
+    """Map an SDK enum's names to their proto numbers.
+
+    The SDK lists each enum's literals in proto order, starting from the zero
+    value, so a name's position is its number. auto-reconnaissance derives
+    the numbers it puts in its stream filter the same way.
+    """
+    return {
+        name: number
+        for number, name in enumerate(typing.get_args(typing.get_args(sdk_enum)[0]))
+    }
+
+
+# Proto enum numbers for the enum fields a stream filter may compare against.
+_ENUM_NUMBERS = {
+    "ontology.template": enum_numbers(OntologyTemplate),
+    "mil_view.disposition": enum_numbers(MilViewDisposition),
+}
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    503: "Service Unavailable",
+}
+
+
+def now_iso() -> str:
+    return datetime.now(UTC).isoformat().replace("+00:00", "Z")
+
+
+def camel(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def field_value(entity: dict, field_path: str):
+    value = entity
+    for name in field_path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(camel(name))
+    return value
+
+
+def set_field(entity: dict, field_path: str, value):
+    *parents, leaf = field_path.split(".")
+    target = entity
+    for name in parents:
+        target = target.setdefault(camel(name), {})
+    target[camel(leaf)] = value
+
+
+class ServerError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class FakeLattice:
+    """In-memory stand-in for the Lattice REST API used by the sample programs.
+
+    Entities and tasks are kept as camelCase JSON dicts, exactly as they go
+    over the wire, so requests are never round-tripped through the SDK models.
+    Every request (except the OAuth token exchange) first waits `latency_ms`
+    plus up to `latency_jitter_ms`, then fails with a 503 with probability
+    `error_rate`, so clients' retry and reconnect paths can be exercised.
+
+    Overrides are kept per entity and field path, as Lattice does, and are
+    applied on top of every later publish of the entity, so an integration
+    re-publishing a track doesn't undo an override.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        latency_ms: float = 0,
+        latency_jitter_ms: float = 0,
+        error_rate: float = 0,
+    ):
+        self.logger = logger
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.entities: dict[str, dict] = {}
+        # entity_id -> {field_path: overridden value}
+        self.overrides: dict[str, dict[str, typing.Any]] = {}
+        self.tasks: dict[str, dict] = {}
+        # One queue of pending AgentRequests per agent entity id.
+        self.agent_requests: dict[str, asyncio.Queue] = {}
+        self.subscribers: set[asyncio.Queue] = set()
+        self.requests = 0
+        self.injected_errors = 0
+        self.routes = [
+            ("POST", re.compile(r"/api/v1/oauth/token"), self.get_token),
+            ("PUT", re.compile(r"/api/v1/entities"), self.publish_entity),
+            ("POST", re.compile(r"/api/v1/entities/stream"), self.stream_entities),
+            (
+                "PUT",
+                re.compile(
+                    r"/api/v1/entities/(?P<entity_id>[^/]+)/override/(?P<field_path>[^/]+)"
+                ),
+                self.override_entity,
+            ),
+            (
+                "GET",
+                re.compile(r"/api/v1/entities/(?P<entity_id>[^/]+)"),
+                self.get_entity,
+            ),
+            ("POST", re.compile(r"/api/v1/tasks"), self.create_task),
+            ("GET", re.compile(r"/api/v1/tasks/(?P<task_id>[^/]+)"), self.get_task),
+            (
+                "PUT",
+                re.compile(r"/api/v1/tasks/(?P<task_id>[^/]+)/status"),
+                self.update_task_status,
+            ),
+            ("POST", re.compile(r"/api/v1/agent/listen"), self.listen_as_agent),
+        ]
+
+    # --- HTTP plumbing -----------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self.dispatch(
+                    method, urlsplit(target).path, headers, body, writer
+                )
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method, path, headers, body, writer):
+        self.requests += 1
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method != method or match is None:
+                continue
+            try:
+                if handler != self.get_token:
+                    await self.inject_faults()
+                if headers.get("content-type", "").startswith("application/json"):
+                    payload = json.loads(body or b"{}")
+                else:
+                    payload = {}
+                params = {
+                    name: unquote(value) for name, value in match.groupdict().items()
+                }
+                response = await handler(payload, writer, **params)
+            except ServerError as error:
+                await self.send_json(writer, error.status, {"message": str(error)})
+                return
+            except json.JSONDecodeError as error:
+                await self.send_json(writer, 400, {"message": f"invalid JSON: {error}"})
+                return
+            if response is not None:
+                await self.send_json(writer, 200, response)
+            return
+        await self.send_json(writer, 404, {"message": f"no route for {method} {path}"})
+
+    async def inject_faults(self):
+        delay_ms = self.latency_ms + random.uniform(0, self.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        if random.random() < self.error_rate:
+            self.injected_errors += 1
+            raise ServerError(503, "injected error")
+
+    @staticmethod
+    async def send_json(writer, status: int, payload):
+        body = json.dumps(payload).encode()
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode()
+            + body
+        )
+        await writer.drain()
+
+    @staticmethod
+    async def send_chunk(writer, data: bytes):
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    # --- Auth --------------------------------------------------------------
+
+    async def get_token(self, payload, writer):
+        return {
+            "access_token": "fake-lattice",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+        }
+
+    # --- Entities ----------------------------------------------------------
+
+    async def publish_entity(self, payload, writer):
+        entity_id = payload.get("entityId")
+        if not entity_id:
+            raise ServerError(400, "entityId is required")
+        existing = self.entities.get(entity_id)
+        payload.setdefault(
+            "createdTime", existing["createdTime"] if existing else now_iso()
+        )
+        for field_path, value in self.overrides.get(entity_id, {}).items():
+            set_field(payload, field_path, value)
+        self.entities[entity_id] = payload
+        self.broadcast(
+            "EVENT_TYPE_UPDATE" if existing else "EVENT_TYPE_CREATED", payload
+        )
+        return payload
+
+    async def get_entity(self, payload, writer, entity_id):
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            raise ServerError(404, f"entity {entity_id} not found")
+        return entity
+
+    async def override_entity(self, payload, writer, entity_id, field_path):
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            raise ServerError(404, f"entity {entity_id} not found")
+        value = field_value(payload.get("entity", {}), field_path)
+        self.overrides.setdefault(entity_id, {})[field_path] = value
+        set_field(entity, field_path, value)
+        self.broadcast("EVENT_TYPE_UPDATE", entity)
+        return entity
+
+    def broadcast(self, event_type: str, entity: dict):
+        for queue in self.subscribers:
+            queue.put_nowait((event_type, entity))
+
+    async def sweep_expired(self):
+        while True:
+            await asyncio.sleep(EXPIRY_SWEEP_SECONDS)
+            now = datetime.now(UTC)
+            expired = [
+                entity_id
+                for entity_id, entity in self.entities.items()
+                if not entity.get("noExpiry")
+                and entity.get("expiryTime")
+                and datetime.fromisoformat(entity["expiryTime"]) <= now
+            ]
+            for entity_id in expired:
+                self.overrides.pop(entity_id, None)
+                self.broadcast("EVENT_TYPE_DELETED", self.entities.pop(entity_id))
+
+    async def stream_entities(self, payload, writer):
+        statement = payload.get("filter")
+        components = payload.get("componentsToInclude")
+        fields = (
+            set(STREAM_BASE_FIELDS) | {camel(name) for name in components}
+            if components
+            else None
+        )
+        heartbeat_seconds = (payload.get("heartbeatIntervalMS") or 0) / 1000
+
+        def event(event_type, entity):
+            if fields is not None:
+                entity = {
+                    name: value for name, value in entity.items() if name in fields
+                }
+            data = {
+                "event": "entity",
+                "eventType": event_type,
+                "time": now_iso(),
+                "entity": entity,
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        queue = asyncio.Queue()
+        self.subscribers.add(queue)
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n"
+            )
+            # Ids of the entities this stream has delivered and not yet deleted.
+            delivered = set()
+            for entity in list(self.entities.values()):
+                if matches(entity, statement):
+                    delivered.add(entity["entityId"])
+                    await self.send_chunk(
+                        writer, event("EVENT_TYPE_PREEXISTING", entity)
+                    )
+            if not payload.get("preExistingOnly"):
+                while True:
+                    try:
+                        event_type, entity = await asyncio.wait_for(
+                            queue.get(), heartbeat_seconds or None
+                        )
+                    except TimeoutError:
+                        heartbeat = {"event": "heartbeat", "timestamp": now_iso()}
+                        await self.send_chunk(
+                            writer, f"data: {json.dumps(heartbeat)}\n\n".encode()
+                        )
+                        continue
+                    entity_id = entity["entityId"]
+                    if event_type == "EVENT_TYPE_DELETED":
+                        if entity_id in delivered:
+                            delivered.discard(entity_id)
+                            await self.send_chunk(writer, event(event_type, entity))
+                    elif matches(entity, statement):
+                        if entity_id not in delivered:
+                            # The entity is new, or has just started matching.
+                            delivered.add(entity_id)
+                            event_type = "EVENT_TYPE_CREATED"
+                        await self.send_chunk(writer, event(event_type, entity))
+                    elif entity_id in delivered:
+                        # The entity stopped matching the filter.
+                        delivered.discard(entity_id)
+                        await self.send_chunk(
+                            writer, event("EVENT_TYPE_DELETED", entity)
+                        )
+            await self.send_chunk(writer, b"")
+        finally:
+            self.subscribers.discard(queue)
+
+    def seed_tracks(self, count: int, center: tuple[float, float], radius_miles: float):
+        """Add `count` non-expiring unknown tracks scattered around `center` for load tests."""
+        for index in range(count):
+            distance = radius_miles * math.sqrt(random.random())
+            bearing = random.uniform(0, 2 * math.pi)
+            latitude = center[0] + distance * math.cos(bearing) / MILES_PER_DEGREE
+            longitude = center[1] + distance * math.sin(bearing) / (
+                MILES_PER_DEGREE * math.cos(math.radians(latitude))
+            )
+            entity_id = f"seeded-track-{index}"
+            self.entities[entity_id] = {
+                "entityId": entity_id,
+                "isLive": True,
+                "noExpiry": True,
+                "createdTime": now_iso(),
+                "location": {
+                    "position": {
+                        "latitudeDegrees": latitude,
+                        "longitudeDegrees": longitude,
+                    }
+                },
+                "milView": {"disposition": "DISPOSITION_UNKNOWN"},
+                "ontology": {"template": "TEMPLATE_TRACK"},
+                "provenance": {
+                    "integrationName": "fake-lattice",
+                    "dataType": "Seeded Track",
+                    "sourceUpdateTime": now_iso(),
+                },
+            }
+
+    # --- Tasks -------------------------------------------------------------
+
+    async def create_task(self, payload, writer):
+        task_id = payload.get("taskId") or str(uuid.uuid4())
+        now = now_iso()
+        task = {
+            "version": {"taskId": task_id, "definitionVersion": 1, "statusVersion": 1},
+            "displayName": payload.get("displayName"),
+            "description": payload.get("description"),
+            "specification": payload.get("specification"),
+            "createdBy": payload.get("author"),
+            "lastUpdatedBy": payload.get("author"),
+            "lastUpdateTime": now,
+            "createTime": now,
+            "status": {"status": "STATUS_CREATED"},
+            "relations": payload.get("relations"),
+            "isExecutedElsewhere": payload.get("isExecutedElsewhere"),
+            "initialEntities": payload.get("initialEntities"),
+        }
+        task = {name: value for name, value in task.items() if value is not None}
+        self.tasks[task_id] = task
+        assignee = field_value(task, "relations.assignee.system.entity_id")
+        if assignee:
+            self.agent_queue(assignee).put_nowait({"executeRequest": {"task": task}})
+            task["status"] = {"status": "STATUS_SENT"}
+        return task
+
+    async def get_task(self, payload, writer, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise ServerError(404, f"task {task_id} not found")
+        return task
+
+    async def update_task_status(self, payload, writer, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            raise ServerError(404, f"task {task_id} not found")
+        status_version = payload.get("statusVersion") or 0
+        # Updates older than what we hold are stale and ignored, as in Lattice.
+        if status_version >= task["version"]["statusVersion"]:
+            task["version"]["statusVersion"] = status_version
+            task["status"] = payload.get("newStatus") or {}
+            task["lastUpdatedBy"] = payload.get("author")
+            task["lastUpdateTime"] = now_iso()
+        return task
+
+    def agent_queue(self, entity_id: str) -> asyncio.Queue:
+        return self.agent_requests.setdefault(entity_id, asyncio.Queue())
+
+    async def listen_as_agent(self, payload, writer):
+        entity_ids = field_value(payload, "agent_selector.entity_ids") or []
+        queues = [self.agent_queue(entity_id) for entity_id in entity_ids]
+        for queue in queues:
+            if not queue.empty():
+                return queue.get_nowait()
+        waiters = [asyncio.create_task(queue.get()) for queue in queues]
+        if not waiters:
+            return {}
+        done, pending = await asyncio.wait(
+            waiters, timeout=LISTEN_TIMEOUT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+        )
+        for waiter in pending:
+            waiter.cancel()
+        # Only one request goes back per poll; put any others back for the next.
+        request = None
+        for queue, waiter in zip(queues, waiters):
+            if waiter not in done:
+                continue
+            if request is None:
+                request = waiter.result()
+            else:
+                queue.put_nowait(waiter.result())
+        return request or {}
+
+
+def matches(entity: dict, statement: dict | None) -> bool:
+    """Evaluate a stream filter Statement against an entity.
+
+    Supports and/or/not and EQUALITY/IN predicates on string and enum values,
+    which covers the filters the sample programs send. Any other predicate is
+    treated as matching, so an unsupported filter errs on streaming too much.
+    """
+    if not statement:
+        return True
+    for operation, combine in (("and", all), ("or", any)):
+        if operation in statement:
+            statements = field_value(statement[operation], "statement_set.statements")
+            predicates = field_value(statement[operation], "predicate_set.predicates")
+            children = [
+                *(statements or []),
+                *({"predicate": predicate} for predicate in predicates or []),
+            ]
+            return combine(matches(entity, child) for child in children)
+    if "not" in statement:
+        child = statement["not"]
+        if "predicate" in child:
+            child = {"predicate": child["predicate"]}
+        else:
+            child = child.get("statement")
+        return not matches(entity, child)
+    predicate = statement.get("predicate")
+    if not predicate:
+        return True
+    field_path = predicate.get("fieldPath", "")
+    comparator = predicate.get("comparator")
+    actual = field_value(entity, field_path)
+    if field_path in _ENUM_NUMBERS:
+        actual = _ENUM_NUMBERS[field_path].get(actual)
+
+    def expected(value: dict):
+        for kind in ("stringType", "enumType"):
+            if kind in value:
+                return value[kind].get("value")
+        return None
+
+    value = predicate.get("value") or {}
+    if comparator == "COMPARATOR_EQUALITY":
+        return actual == expected(value)
+    if comparator == "COMPARATOR_IN":
+        values = field_value(value, "list_type.values") or []
+        return actual in [expected(item) for item in values]
+    return True
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Fake Lattice Server")
+    parser.add_argument(
+        "--config", type=str, help="Path to the configuration file", required=True
+    )
+    return parser.parse_args()
+
+
+def read_config(config_path):
+    with open(config_path, "r") as config_file:
+        return yaml.safe_load(config_file)
+
+
+async def serve(logger, cfg):
+    lattice = FakeLattice(
+        logger,
+        latency_ms=cfg.get("fake-lattice-latency-ms", 0),
+        latency_jitter_ms=cfg.get("fake-lattice-latency-jitter-ms", 0),
+        error_rate=cfg.get("fake-lattice-error-rate", 0),
+    )
+    seed_tracks = cfg.get("fake-lattice-seed-tracks", 0)
+    if seed_tracks:
+        lattice.seed_tracks(
+            seed_tracks,
+            (cfg["track-latitude"], cfg["track-longitude"]),
+            cfg.get("fake-lattice-seed-radius-miles", DEFAULT_SEED_RADIUS_MILES),
+        )
+        logger.info(f"seeded {seed_tracks} tracks")
+    host = cfg.get("fake-lattice-host", DEFAULT_HOST)
+    port = cfg.get("fake-lattice-port", DEFAULT_PORT)
+    server = await asyncio.start_server(lattice.handle_connection, host, port)
+    logger.info(f"fake lattice listening on http://{host}:{port}")
+    sweeper = asyncio.create_task(lattice.sweep_expired())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def main():
+    logging.basicConfig()
+    logger = logging.getLogger("FAKELATTICE")
+    logger.setLevel(logging.DEBUG)
+
+    args = parse_arguments()
+    cfg = read_config(args.config)
+
+    try:
+        asyncio.run(serve(logger, cfg))
+    except KeyboardInterrupt:
+        logger.info("shutting down fake lattice")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,7 @@ from anduril import (
     TaskStatus,
 )
 from anduril.core import ApiError
+from objective_cache import DEFAULT_OBJECTIVE_MAX_AGE_SECONDS, ObjectiveCache
 from orbit import OrbitTask
 
 EXPIRY_OFFSET = 15
@@ -46,10 +47,13 @@ class SimulatedAsset:
         entity_id: str,
         location: dict,
         climb_rate_mps: float,
+        objectives: ObjectiveCache,
     ):
         self.logger = logger
         self.client = client
         self.entity_id = entity_id
+        # Objective positions, shared with every other asset in the process.
+        self.objectives = objectives
 
         self.location = location  # Dict with latitude, longitude, altitude_hae_meters.
         self.velocity_enu = {
@@ -245,7 +249,8 @@ class SimulatedAsset:
         """Return the (latitude, longitude, altitude_hae_m) center for an Orbit objective.
 
         The objective is a oneof: either an inline `lla` position or an
-        `entityId` we resolve to a live entity's current location.
+        `entityId` we resolve to a live entity's current location, read from
+        the shared objective cache so a tick doesn't cost a network round trip.
         """
         if not objective:
             raise ValueError("orbit task has no objective")
@@ -260,17 +265,20 @@ class SimulatedAsset:
 
         entity_id = objective.get("entityId")
         if entity_id:
-            entity = await self.client.entities.get_entity(entity_id)
-            position = entity.location.position
-            return (
-                position.latitude_degrees,
-                position.longitude_degrees,
-                position.altitude_hae_meters or 0.0,
-            )
+            return await self.objectives.position(entity_id)
 
         raise ValueError(f"unsupported orbit objective: {objective}")
 
 
+async def run_assets(objectives: ObjectiveCache, assets: list[SimulatedAsset]):
+    """Run the assets alongside the objective stream they share."""
+    stream = asyncio.create_task(objectives.run())
+    try:
+        await asyncio.gather(*(asset.run() for asset in assets))
+    finally:
+        stream.cancel()
+
+
 def validate_config(cfg):
     if "lattice-endpoint" not in cfg:
         raise ValueError("missing lattice-endpoint")
@@ -284,6 +292,20 @@ def validate_config(cfg):
         raise ValueError("missing asset-longitude")
 
 
+def lattice_base_url(endpoint: str) -> str:
+    """Build the SDK base URL for a `lattice-endpoint` config value.
+
+    Endpoints are normally bare hosts served over HTTPS. One that already
+    carries a scheme, such as `http://localhost:8080` for a local fake Lattice,
+    is used as given.
+
+    The programs share no modules, so auto-reconnaissance/utils/endpoint.py,
+    simulated_asset/asset.py and simulated_track/track.py each carry a copy
+    of this function; keep them in sync.
+    """
+    return endpoint if "://" in endpoint else f"https://{endpoint}"
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Simulated Asset")
     parser.add_argument(
@@ -309,13 +331,18 @@ def main():
     cfg = read_config(args.config)
 
     client = AsyncLattice(
-        base_url=f"https://{cfg['lattice-endpoint']}",
+        base_url=lattice_base_url(cfg["lattice-endpoint"]),
         client_id=cfg["lattice-client-id"],
         client_secret=cfg["lattice-client-secret"],
         headers={"anduril-sandbox-authorization": f"Bearer {cfg['sandboxes-token']}"},
         timeout=300,
     )  # 5 minutes for long polling
 
+    objectives = ObjectiveCache(
+        logger,
+        client,
+        cfg.get("objective-max-age-seconds", DEFAULT_OBJECTIVE_MAX_AGE_SECONDS),
+    )
     asset = SimulatedAsset(
         logger,
         client,
@@ -326,10 +353,11 @@ def main():
             "altitude_hae_meters": cfg["asset_altitude_hae_meters"],
         },
         cfg["asset_climb_rate"],
+        objectives,
     )
 
     try:
-        asyncio.run(asset.run())
+        asyncio.run(run_assets(objectives, [asset]))
     except KeyboardInterrupt:
         logger.info("keyboard interrupt detected")
 
@@ -0,0 +1,219 @@
+"""Shared cache of Orbit objective positions for the simulated asset.
+
+An Orbit objective given as an `entityId` is re-resolved on every flight tick
+so the asset follows it as it moves. `ObjectiveCache` answers those lookups
+from memory, kept current by a single entity stream shared by every asset in
+the process and filtered to the watched entities, and only calls the REST
+API when it has no position it can trust.
+"""
+
+import asyncio
+import random
+import time
+from logging import Logger
+
+from anduril import AsyncLattice, ListType, Predicate, Statement, StringType, Value
+from anduril.core import ApiError
+
+# How long a cached position is trusted when the stream can't vouch for it.
+DEFAULT_OBJECTIVE_MAX_AGE_SECONDS = 5
+# Objectives no asset has asked about for this long are dropped from the cache.
+OBJECTIVE_IDLE_SECONDS = 60
+# Reconnect delays for the objective stream (jittered, doubling up to the max).
+STREAM_BACKOFF_INITIAL_SECONDS = 1
+STREAM_BACKOFF_MAX_SECONDS = 60
+# Only the position is needed, so everything else is left off the stream.
+STREAM_COMPONENTS = ("location",)
+
+
+class ObjectiveCache:
+    """Latest (latitude, longitude, altitude_hae_m) of each entity used as an objective.
+
+    Only entities an asset has asked for are cached, and the stream runs
+    only while at least one is. The stream is filtered to those entities and
+    reopened whenever the set changes. A cached position is used as is while the
+    stream is connected, has delivered the position since connecting and has
+    been heard from (heartbeats included) within `max_age`; the stream
+    reports every change, so no news means the position still holds. When
+    the stream is down or has gone quiet, a position is trusted for `max_age`
+    after it arrived, and after that the entity is fetched over REST and the
+    result cached, so an outage costs one REST call per objective per
+    `max_age` rather than one per tick.
+    """
+
+    def __init__(
+        self,
+        logger: Logger,
+        client: AsyncLattice,
+        max_age: float = DEFAULT_OBJECTIVE_MAX_AGE_SECONDS,
+    ):
+        self.logger = logger
+        self.client = client
+        self.max_age = max_age
+        # entity_id -> (latitude, longitude, altitude_hae_m, monotonic time received).
+        self.positions: dict[str, tuple[float, float, float, float]] = {}
+        # entity_id -> monotonic time an asset last asked for it.
+        self.watched: dict[str, float] = {}
+        self.watching = asyncio.Event()
+        # Set when an entity starts or stops being watched, to reopen the stream.
+        self.watched_changed = asyncio.Event()
+        # Monotonic time the current stream connected; None while disconnected.
+        self.connected_at: float | None = None
+        self.last_heard = 0.0
+        self.hits = 0
+        self.fallbacks = 0
+
+    def _trusted(self, received: float, now: float) -> bool:
+        if now - received <= self.max_age:
+            return True
+        return (
+            self.connected_at is not None
+            and received >= self.connected_at
+            and now - self.last_heard <= self.max_age
+        )
+
+    async def position(self, entity_id: str) -> tuple[float, float, float]:
+        now = time.monotonic()
+        if entity_id not in self.watched:
+            self.watched_changed.set()
+        self.watched[entity_id] = now
+        self.watching.set()
+        cached = self.positions.get(entity_id)
+        if cached is not None and self._trusted(cached[3], now):
+            self.hits += 1
+            return cached[:3]
+        self.fallbacks += 1
+        entity = await self.client.entities.get_entity(entity_id)
+        latest = self.positions.get(entity_id)
+        # Keep a stream update that arrived while the fetch was in flight.
+        if latest is not None and latest[3] > now:
+            return latest[:3]
+        position = entity.location.position
+        self.positions[entity_id] = (
+            position.latitude_degrees,
+            position.longitude_degrees,
+            position.altitude_hae_meters or 0.0,
+            time.monotonic(),
+        )
+        return self.positions[entity_id][:3]
+
+    def _apply(self, event):
+        entity = event.entity
+        if entity.entity_id not in self.watched:
+            return
+        if event.event_type == "EVENT_TYPE_DELETED":
+            self.positions.pop(entity.entity_id, None)
+            return
+        position = entity.location.position if entity.location else None
+        if position is None:
+            return
+        self.positions[entity.entity_id] = (
+            position.latitude_degrees,
+            position.longitude_degrees,
+            position.altitude_hae_meters or 0.0,
+            time.monotonic(),
+        )
+
+    def _prune(self, now: float):
+        """Stop caching objectives no asset has asked about for a while."""
+        for entity_id, requested in list(self.watched.items()):
+            if now - requested > OBJECTIVE_IDLE_SECONDS:
+                del self.watched[entity_id]
+                self.positions.pop(entity_id, None)
+                self.watched_changed.set()
+        if not self.watched:
+            self.watching.clear()
+
+    async def _stream(self, entity_ids: list[str]):
+        """Apply updates for `entity_ids` until the stream ends or none are watched."""
+        async for event in self.client.entities.stream_entities(
+            filter=watched_filter(entity_ids),
+            components_to_include=STREAM_COMPONENTS,
+            heartbeat_interval_ms=int(self.max_age * 1000 / 2),
+        ):
+            self.last_heard = time.monotonic()
+            if event.event == "entity" and event.entity is not None:
+                self._apply(event)
+            else:
+                self._prune(self.last_heard)
+                if not self.watching.is_set():
+                    self.logger.info("no objectives left to watch, closing stream")
+                    return
+        self.logger.warning("objective stream closed by server")
+
+    async def _stream_until_changed(self) -> bool:
+        """Stream the watched entities until the stream ends or the set changes.
+
+        Returns:
+            bool: True if the stream was closed to follow a change to the set.
+        """
+        self.watched_changed.clear()
+        stream = asyncio.create_task(self._stream(list(self.watched)))
+        changed = asyncio.create_task(self.watched_changed.wait())
+        try:
+            await asyncio.wait((stream, changed), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            changed.cancel()
+            if not stream.done():
+                stream.cancel()
+                await asyncio.gather(stream, return_exceptions=True)
+        if stream.cancelled():
+            return True
+        # Re-raises whatever ended the stream.
+        stream.result()
+        return False
+
+    async def run(self):
+        """Keep the objective stream open while any objective is watched.
+
+        The stream reconnects with jittered exponential backoff, reopens
+        straight away when the watched set changes, and is closed once no
+        asset has asked for an objective in a while.
+        """
+        attempt = 0
+        while True:
+            await self.watching.wait()
+            try:
+                self.connected_at = self.last_heard = time.monotonic()
+                if await self._stream_until_changed():
+                    attempt = 0
+                    continue
+                # Only back off from a stream that failed before it was heard from.
+                if self.last_heard > self.connected_at:
+                    attempt = 0
+            except ApiError as error:
+                self.logger.error(f"lattice api stream entities error {error}")
+            except Exception:
+                self.logger.exception("objective stream failed")
+            finally:
+                self.connected_at = None
+            if not self.watching.is_set():
+                continue
+            delay = random.uniform(
+                0,
+                min(
+                    STREAM_BACKOFF_MAX_SECONDS,
+                    STREAM_BACKOFF_INITIAL_SECONDS * 2**attempt,
+                ),
+            )
+            attempt += 1
+            self.logger.info(f"reconnecting objective stream in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def watched_filter(entity_ids: list[str]) -> Statement:
+    """Stream filter matching only the given entity ids."""
+    return Statement(
+        predicate=Predicate(
+            field_path="entity_id",
+            value=Value(
+                list_type=ListType(
+                    values=[
+                        Value(string_type=StringType(value=entity_id))
+                        for entity_id in entity_ids
+                    ]
+                )
+            ),
+            comparator="COMPARATOR_IN",
+        )
+    )
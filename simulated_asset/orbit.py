@@ -9,15 +9,11 @@ future task handlers.
 """
 
 import asyncio
+import functools
 import json
 import math
 from pathlib import Path
 
-from geopy import Point
-from geopy.distance import distance as geo_distance
-from geopy.distance import geodesic
-from jsonschema import Draft202012Validator
-
 # Orbit behavior tuning.
 GROUND_SPEED_MPS = 60  # Ground speed for both the ingress leg and the circling leg.
 ORBIT_TICK_SECONDS = 1  # Simulation step; smaller values produce smoother motion.
@@ -37,7 +33,68 @@ _ORBIT_SCHEMA_PATH = (
     _SCHEMA_DIR
     / "anduril.sample_app_auto_reconnaissance.v1.Orbit.jsonschema.bundle.json"
 )
-_ORBIT_VALIDATOR = Draft202012Validator(json.loads(_ORBIT_SCHEMA_PATH.read_text()))
+_OBJECTIVE_DEFINITION = (
+    "anduril.sample_app_auto_reconnaissance.v1.Objective.jsonschema.json"
+)
+PARAMETER_CACHE_SIZE = 64
+
+
+@functools.cache
+def _orbit_validators():
+    """(Orbit payload validator, objective validator), built when the first task arrives.
+
+    jsonschema is slow to import and most asset runs take a while to receive
+    a task, so the schema isn't loaded at startup. The schema constrains each
+    property independently, so the objective (which differs per task) is
+    validated on its own, and the orbit parameters (which rarely change) are
+    validated once per distinct combination.
+    """
+    from jsonschema import Draft202012Validator
+
+    schema = json.loads(_ORBIT_SCHEMA_PATH.read_text())
+    orbit = Draft202012Validator(schema)
+    return orbit, orbit.evolve(schema=schema["$defs"][_OBJECTIVE_DEFINITION])
+
+
+def _schema_errors(validator, payload, path=()):
+    """Describe every schema violation in `payload`, or return None if it is valid."""
+    errors = sorted(validator.iter_errors(payload), key=lambda e: list(e.path))
+    if not errors:
+        return None
+    return "; ".join(f"{[*path, *e.path]}: {e.message}" for e in errors)
+
+
+@functools.lru_cache(maxsize=PARAMETER_CACHE_SIZE)
+def _parameter_errors(parameters):
+    """Validate the non-objective fields, given as sorted (name, type, value) triples.
+
+    The type is part of the key because JSON Schema tells apart values Python
+    hashes alike, such as True and 1.
+    """
+    return _schema_errors(
+        _orbit_validators()[0], {name: value for name, _, value in parameters}
+    )
+
+
+def validate_spec(spec):
+    """Return a description of what is wrong with an Orbit payload, or None."""
+    parameters = {name: value for name, value in spec.items() if name != "objective"}
+    try:
+        details = _parameter_errors(
+            tuple(
+                sorted((name, type(value), value) for name, value in parameters.items())
+            )
+        )
+    except TypeError:
+        # Unhashable values (objects or lists where scalars belong) are invalid
+        # anyway; validate them uncached to describe the problem.
+        details = _schema_errors(_orbit_validators()[0], parameters)
+    if "objective" in spec:
+        objective_details = _schema_errors(
+            _orbit_validators()[1], spec["objective"], ("objective",)
+        )
+        details = "; ".join(filter(None, (details, objective_details))) or None
+    return details
 
 
 # --- Pure geodesic helpers -------------------------------------------------
@@ -57,6 +114,11 @@ def bearing(origin, destination):
 
 def destination_point(origin, bearing_deg, meters):
     """Point reached by traveling `meters` along `bearing_deg` from `origin`."""
+    # geopy is only needed once an orbit is flying, and importing it costs
+    # ~100 ms of startup, so it is imported on first use.
+    from geopy import Point
+    from geopy.distance import distance as geo_distance
+
     point = geo_distance(meters=meters).destination(
         Point(origin[0], origin[1]), bearing=bearing_deg
     )
@@ -65,6 +127,8 @@ def destination_point(origin, bearing_deg, meters):
 
 def distance_m(a, b):
     """Geodesic distance in meters between two (lat, lon) points."""
+    from geopy.distance import geodesic
+
     return geodesic(a, b).meters
 
 
@@ -142,9 +206,8 @@ class OrbitTask:
         spec = specification.model_dump(by_alias=True, exclude_none=True)
         spec.pop("@type", None)
 
-        errors = sorted(_ORBIT_VALIDATOR.iter_errors(spec), key=lambda e: list(e.path))
-        if errors:
-            details = "; ".join(f"{list(e.path)}: {e.message}" for e in errors)
+        details = validate_spec(spec)
+        if details:
             raise OrbitExecutionError(f"invalid Orbit task payload: {details}")
 
         return {
@@ -33,6 +33,20 @@ def validate_config(cfg):
         raise ValueError("missing track-longitude")
 
 
+def lattice_base_url(endpoint: str) -> str:
+    """Build the SDK base URL for a `lattice-endpoint` config value.
+
+    Endpoints are normally bare hosts served over HTTPS. One that already
+    carries a scheme, such as `http://localhost:8080` for a local fake Lattice,
+    is used as given.
+
+    The programs share no modules, so auto-reconnaissance/utils/endpoint.py,
+    simulated_asset/asset.py and simulated_track/track.py each carry a copy
+    of this function; keep them in sync.
+    """
+    return endpoint if "://" in endpoint else f"https://{endpoint}"
+
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Simulated Track")
     parser.add_argument(
@@ -62,7 +76,7 @@ def start_track_publishing():
     sandboxes_token = cfg["sandboxes-token"]
 
     client = Lattice(
-        base_url=f"https://{cfg['lattice-endpoint']}",
+        base_url=lattice_base_url(cfg["lattice-endpoint"]),
         client_id=cfg["lattice-client-id"],
         client_secret=cfg["lattice-client-secret"],
         headers={"anduril-sandbox-authorization": f"Bearer {sandboxes_token}"},